@@ -1,5 +1,6 @@
 import os
 import sys
+from functools import lru_cache
 from pathlib import Path
 
 
@@ -9,5 +10,15 @@ if str(BASE_DIR) not in sys.path:
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "cv_project.settings")
 
-from cv_project.wsgi import application as app  # noqa: E402
 
+@lru_cache(maxsize=1)
+def _application():
+    # Django (settings, apps, URLconf and views) is set up on the first request rather than
+    # when the runtime imports this module.
+    from cv_project.wsgi import application
+
+    return application
+
+
+def app(environ, start_response):
+    return _application()(environ, start_response)
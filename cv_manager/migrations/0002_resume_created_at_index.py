@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("cv_manager", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="resume",
+            name="created_at",
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+    ]
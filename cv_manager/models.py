@@ -7,7 +7,7 @@ class Resume(models.Model):
     language = models.CharField(max_length=20, blank=True, default="")
     raw_text = models.TextField(blank=True, default="")
     cv_json = models.JSONField(default=dict)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
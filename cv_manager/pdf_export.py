@@ -1,54 +1,195 @@
+import atexit
+import copy
+import hashlib
+import json
+import os
+import threading
+from functools import lru_cache
+from html import escape
 from io import BytesIO
+from itertools import repeat
+from pathlib import Path
+from typing import BinaryIO, NamedTuple
 
+PDF_DEBUG = os.getenv("CV_PDF_DEBUG", "False").lower() == "true"
+# "reportlab" (default) or "html" for the template + WeasyPrint renderer.
+PDF_BACKEND = os.getenv("CV_PDF_BACKEND", "reportlab").strip().lower()
+# Least recently used PDFs are removed beyond this many files (see build_cv_pdf's cache_dir).
+PDF_CACHE_MAX_FILES = int(os.getenv("CV_PDF_CACHE_MAX_FILES", "500"))
+# Part of every cache key: bump it whenever the rendered output changes (layout, styles,
+# fonts) so PDFs produced by an older build are no longer served.
+_PDF_CACHE_VERSION = 1
+# The cache directory is listed and pruned once every this many stores, not on every miss.
+_PDF_CACHE_PRUNE_EVERY = 32
+_pdf_cache_stores = 0
+# Upper bound on render processes for build_cv_pdfs_parallel (also capped by the CPU count).
+PDF_BUILD_MAX_WORKERS = int(os.getenv("CV_PDF_BUILD_MAX_WORKERS", "4"))
 
-def _template_palette(template_name: str) -> dict:
+# Built-in fonts used by the templates (body text and <b> markup).
+PDF_FONTS = ("Helvetica", "Helvetica-Bold")
+
+try:
+    from reportlab import rl_config
     from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.platypus import BaseDocTemplate, Flowable, Frame, PageTemplate, Paragraph, SimpleDocTemplate, Spacer
+except ImportError as exc:
+    # Resolved once at import; build functions raise from this error when reportlab is missing.
+    _REPORTLAB_ERROR = exc
+    SimpleDocTemplate = None
+    Flowable = object
+else:
+    _REPORTLAB_ERROR = None
+    # Attribute validation on reportlab shapes is a development aid; with it off,
+    # invalid attribute assignments no longer raise. Set CV_PDF_DEBUG=true to keep it.
+    if not PDF_DEBUG:
+        rl_config.shapeChecking = 0
+    # Load font metrics at import so the first request does not pay for the lazy lookup.
+    for _font_name in PDF_FONTS:
+        pdfmetrics.getFont(_font_name)
+    # Usable width of the page frame: A4 minus the 28pt margins and the frame's 6pt paddings.
+    _FRAME_WIDTH = A4[0] - 2 * 28 - 2 * 6
+
+TEMPLATE_NAMES = ("simple", "modern", "elegant")
+PALETTE_HEX = {
+    "simple": {"accent": "#1f2937", "subtle": "#4b5563", "line": "#d1d5db"},
+    "modern": {"accent": "#0f766e", "subtle": "#155e75", "line": "#99f6e4"},
+    "elegant": {"accent": "#7c2d12", "subtle": "#78350f", "line": "#fcd34d"},
+}
+
+
+class Palette(NamedTuple):
+    accent: "colors.Color"
+    subtle: "colors.Color"
+    line: "colors.Color"
+
 
-    palettes = {
-        "simple": {
-            "accent": colors.HexColor("#1f2937"),
-            "subtle": colors.HexColor("#4b5563"),
-            "line": colors.HexColor("#d1d5db"),
-        },
-        "modern": {
-            "accent": colors.HexColor("#0f766e"),
-            "subtle": colors.HexColor("#155e75"),
-            "line": colors.HexColor("#99f6e4"),
-        },
-        "elegant": {
-            "accent": colors.HexColor("#7c2d12"),
-            "subtle": colors.HexColor("#78350f"),
-            "line": colors.HexColor("#fcd34d"),
-        },
+# HexColor objects are built once at import; templates share these instances.
+_PALETTES = (
+    {
+        name: Palette(*(colors.HexColor(hex_palette[field]) for field in Palette._fields))
+        for name, hex_palette in PALETTE_HEX.items()
     }
-    return palettes.get(template_name, palettes["simple"])
+    if _REPORTLAB_ERROR is None
+    else {}
+)
 
 
-def build_cv_pdf(cv: dict, template_name: str = "simple", title: str = "CV") -> bytes:
-    try:
-        from reportlab.lib.pagesizes import A4
-        from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
-        from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
-    except Exception as exc:
-        raise ValueError("Missing dependency: reportlab. Install requirements.txt") from exc
+_EXPERIENCE_FIELDS = ("title", "company", "startDate", "endDate", "location", "bullets")
+
+_BASE_STYLES = None
+_STYLES_CACHE: dict[str, tuple] = {}
+_SECTION_HEADERS: dict[tuple[str, str], object] = {}
+
+
+class _EducationRow(Flowable):
+    # Two side-by-side paragraphs with a rule underneath: the layout the education table
+    # used to produce, without Table's per-cell style and column-width passes.
+    LEFT_WIDTH = 350
+    RIGHT_WIDTH = 170
+    TOP_PADDING = 3
+    BOTTOM_PADDING = 5
+
+    def __init__(self, left, right, line_color):
+        super().__init__()
+        self.left = left
+        self.right = right
+        self.line_color = line_color
+        self.hAlign = "CENTER"
+
+    def wrap(self, availWidth, availHeight):
+        _, self._left_height = self.left.wrap(self.LEFT_WIDTH, availHeight)
+        _, self._right_height = self.right.wrap(self.RIGHT_WIDTH, availHeight)
+        self.width = self.LEFT_WIDTH + self.RIGHT_WIDTH
+        self.height = max(self._left_height, self._right_height) + self.TOP_PADDING + self.BOTTOM_PADDING
+        return self.width, self.height
+
+    def draw(self):
+        top = self.height - self.TOP_PADDING
+        self.left.drawOn(self.canv, 0, top - self._left_height)
+        self.right.drawOn(self.canv, self.LEFT_WIDTH, top - self._right_height)
+        self.canv.setStrokeColor(self.line_color)
+        self.canv.setLineWidth(0.25)
+        self.canv.line(0, 0, self.width, 0)
+
+
+class SimpleLine(Flowable):
+    # Single line of plain text drawn with drawString: no markup parse, no line breaking.
+    # Metrics come from the paragraph style it replaces so the layout stays identical.
+    def __init__(self, text, style):
+        super().__init__()
+        self.text = text
+        self.style = style
+
+    def wrap(self, availWidth, availHeight):
+        self.width = availWidth
+        self.height = self.style.leading
+        return self.width, self.height
+
+    def getSpaceBefore(self):
+        return self.style.spaceBefore
+
+    def getSpaceAfter(self):
+        return self.style.spaceAfter
+
+    def draw(self):
+        self.canv.setFont(self.style.fontName, self.style.fontSize)
+        self.canv.setFillColor(self.style.textColor)
+        self.canv.drawString(0, self.height - self.style.fontSize, self.text)
+
 
+def _plain_line(text: str, style):
+    # Paragraph collapses runs of whitespace; do the same, and keep Paragraph when the text
+    # would need wrapping.
+    text = " ".join(text.split())
+    if pdfmetrics.stringWidth(text, style.fontName, style.fontSize) <= _FRAME_WIDTH:
+        return SimpleLine(text, style)
+    return Paragraph(_esc(text), style)
+
+
+@lru_cache(maxsize=1024)
+def _escape_text(text: str) -> str:
+    return escape(text, quote=False)
+
+
+def _esc(value) -> str:
+    # Paragraph text is mini-HTML: user values are escaped before any markup is added.
+    # The cache pays off on names repeated across batch builds (companies, schools).
+    return _escape_text(value if isinstance(value, str) else str(value))
+
+
+def _template_palette(template_name: str) -> Palette:
+    return _PALETTES.get(template_name) or _PALETTES["simple"]
+
+
+def _template_styles(template_name: str) -> tuple:
+    # Styles are immutable once built, so they are shared across PDF builds.
+    if template_name not in TEMPLATE_NAMES:
+        template_name = "simple"
+    cached = _STYLES_CACHE.get(template_name)
+    if cached is not None:
+        return cached
+
+    global _BASE_STYLES
+    if _BASE_STYLES is None:
+        _BASE_STYLES = getSampleStyleSheet()
+    styles = _BASE_STYLES
     palette = _template_palette(template_name)
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=28, leftMargin=28, topMargin=28, bottomMargin=28)
-    styles = getSampleStyleSheet()
 
     title_style = ParagraphStyle(
         "TitleStyle",
         parent=styles["Heading1"],
         fontSize=20,
-        textColor=palette["accent"],
+        textColor=palette.accent,
         spaceAfter=8,
     )
     section_style = ParagraphStyle(
         "SectionStyle",
         parent=styles["Heading2"],
         fontSize=12,
-        textColor=palette["subtle"],
+        textColor=palette.subtle,
         spaceBefore=10,
         spaceAfter=6,
     )
@@ -58,75 +199,320 @@ def build_cv_pdf(cv: dict, template_name: str = "simple", title: str = "CV") ->
         fontSize=10,
         leading=14,
     )
+    cached = (title_style, section_style, body_style)
+    _STYLES_CACHE[template_name] = cached
+    return cached
+
+
+def _section_header(template_name: str, text: str):
+    # Keep one parsed Paragraph per header and hand out shallow copies: layout state
+    # from wrap/split lands on the copy, the parsed fragments are shared.
+    if template_name not in TEMPLATE_NAMES:
+        template_name = "simple"
+    key = (template_name, text)
+    header = _SECTION_HEADERS.get(key)
+    if header is None:
+        header = Paragraph(text, _template_styles(template_name)[1])
+        _SECTION_HEADERS[key] = header
+    return copy.copy(header)
+
+
+def build_cv_pdf(
+    cv: dict,
+    template_name: str = "simple",
+    title: str = "CV",
+    return_stream: bool = False,
+    out: BinaryIO | None = None,
+    cache_dir: str | Path | None = None,
+) -> bytes | BytesIO | None:
+    if SimpleDocTemplate is None:
+        raise ValueError("Missing dependency: reportlab. Install requirements.txt") from _REPORTLAB_ERROR
+
+    if cache_dir:
+        # Identical (cv, template, title) inputs produce identical PDFs, so re-renders are
+        # served from disk.
+        cache_path = _pdf_cache_path(Path(cache_dir), cv, template_name, title)
+        try:
+            pdf = cache_path.read_bytes()
+        except OSError:
+            buffer = BytesIO()
+            _render_cv_pdf(buffer, cv, template_name, title)
+            pdf = buffer.getvalue()
+            _store_cached_pdf(cache_path, pdf)
+        else:
+            _touch_cached_pdf(cache_path)
+        if out is not None:
+            out.write(pdf)
+            return None
+        return BytesIO(pdf) if return_stream else pdf
+
+    # With `out` (any object with .write(), e.g. an HttpResponse) the PDF goes straight to
+    # the sink and nothing is returned.
+    buffer = out if out is not None else BytesIO()
+    _render_cv_pdf(buffer, cv, template_name, title)
+    if out is not None:
+        return None
+    if return_stream:
+        # Hand the buffer over as-is so callers can stream it without copying the bytes out.
+        buffer.seek(0)
+        return buffer
+    return buffer.getvalue()
+
+
+def _render_cv_pdf(target, cv: dict, template_name: str, title: str) -> None:
+    doc = SimpleDocTemplate(target, pagesize=A4, rightMargin=28, leftMargin=28, topMargin=28, bottomMargin=28)
+    doc.build(_cv_story(cv, template_name, title))
+
+
+def _pdf_cache_path(cache_dir: Path, cv: dict, template_name: str, title: str) -> Path:
+    # The renderer name keeps these keys apart from any other backend sharing the directory.
+    key_parts = [_PDF_CACHE_VERSION, "reportlab", cv, template_name, title]
+    payload = json.dumps(key_parts, sort_keys=True, ensure_ascii=False, default=str)
+    key = hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+    return cache_dir / f"{key}.pdf"
+
+
+def _touch_cached_pdf(cache_path: Path) -> None:
+    # Hits refresh the mtime, so pruning by mtime evicts the least recently used files.
+    try:
+        os.utime(cache_path)
+    except OSError:
+        pass
+
+
+def _store_cached_pdf(cache_path: Path, pdf: bytes) -> None:
+    global _pdf_cache_stores
+    # Write-then-rename so concurrent readers never see a partial file. The cache is an
+    # optimization only: any filesystem error just skips it.
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(pdf)
+        os.replace(tmp_path, cache_path)
+        # Prune on the first store of the process, then every _PDF_CACHE_PRUNE_EVERY stores.
+        due = _pdf_cache_stores % _PDF_CACHE_PRUNE_EVERY == 0
+        _pdf_cache_stores += 1
+        if due:
+            _prune_pdf_cache(cache_path.parent)
+    except OSError:
+        pass
+
+
+def _prune_pdf_cache(cache_dir: Path) -> None:
+    entries = sorted(cache_dir.glob("*.pdf"), key=lambda p: p.stat().st_mtime)
+    for stale in entries[: max(0, len(entries) - PDF_CACHE_MAX_FILES)]:
+        stale.unlink(missing_ok=True)
+
+
+def build_cv_pdfs_batch(cvs: list[dict], template_name: str = "simple", title: str = "CV") -> list[bytes]:
+    if SimpleDocTemplate is None:
+        raise ValueError("Missing dependency: reportlab. Install requirements.txt") from _REPORTLAB_ERROR
+
+    # Same geometry as build_cv_pdf, but the document, page template and frame are set up
+    # once; each CV only gets a fresh output buffer.
+    doc = BaseDocTemplate(BytesIO(), pagesize=A4, rightMargin=28, leftMargin=28, topMargin=28, bottomMargin=28)
+    frame = Frame(doc.leftMargin, doc.bottomMargin, doc.width, doc.height, id="normal")
+    doc.addPageTemplates([PageTemplate(id="First", frames=[frame], pagesize=doc.pagesize)])
+
+    pdfs: list[bytes] = []
+    for cv in cvs:
+        buffer = BytesIO()
+        doc.filename = buffer
+        doc.build(_cv_story(cv, template_name, title))
+        pdfs.append(buffer.getvalue())
+    return pdfs
+
+
+def build_cv_pdfs_parallel(
+    cvs: list[dict], template_name: str = "simple", title: str = "CV", max_workers: int | None = None
+) -> list[bytes]:
+    # Rendering is pure-Python CPU work, so batches are spread over processes. Each worker
+    # renders whole chunks through build_cv_pdfs_batch; tiny batches are not worth the
+    # process start-up and stay serial.
+    pool_size = min(PDF_BUILD_MAX_WORKERS, os.cpu_count() or 1)
+    workers = min(max_workers or pool_size, pool_size)
+    if len(cvs) < 4 or workers < 2:
+        return build_cv_pdfs_batch(cvs, template_name, title)
+
+    from concurrent.futures.process import BrokenProcessPool
+
+    size = max(1, len(cvs) // (workers * 4))
+    chunks = [cvs[i : i + size] for i in range(0, len(cvs), size)]
+    pool = None
+    try:
+        pool = _pdf_build_pool(pool_size)
+        results = pool.map(build_cv_pdfs_batch, chunks, repeat(template_name), repeat(title))
+        return [pdf for chunk in results for pdf in chunk]
+    except (OSError, BrokenProcessPool):
+        # Sandboxed runtimes without multiprocessing support, or a crashed worker.
+        if pool is not None:
+            _discard_pdf_build_pool(pool)
+        return build_cv_pdfs_batch(cvs, template_name, title)
+
+
+_PDF_BUILD_POOL = None
+_PDF_BUILD_POOL_LOCK = threading.Lock()
+
+
+def _pdf_build_pool(workers: int):
+    # Same scheme as services._pdf_extract_pool: one lazily created pool per web worker,
+    # reused across exports, with workers started by a fork server (or spawned) instead of
+    # forked from a threaded server process.
+    global _PDF_BUILD_POOL
+    with _PDF_BUILD_POOL_LOCK:
+        if _PDF_BUILD_POOL is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _PDF_BUILD_POOL = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method))
+            atexit.register(_PDF_BUILD_POOL.shutdown)
+        return _PDF_BUILD_POOL
+
+
+def _discard_pdf_build_pool(pool) -> None:
+    global _PDF_BUILD_POOL
+    with _PDF_BUILD_POOL_LOCK:
+        if _PDF_BUILD_POOL is pool:
+            _PDF_BUILD_POOL = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _cv_story(cv: dict, template_name: str, title: str) -> list:
+    palette = _template_palette(template_name)
+    title_style, _, body_style = _template_styles(template_name)
 
     story = []
-    personal = cv.get("personal", {}) if isinstance(cv, dict) else {}
+    src = cv if isinstance(cv, dict) else {}
+    personal = src.get("personal") or {}
+    if not isinstance(personal, dict):
+        personal = {}
     full_name = f"{personal.get('firstName', '')} {personal.get('lastName', '')}".strip() or title
     contact_line = " | ".join(
-        [x for x in [personal.get("city", ""), personal.get("phone", ""), personal.get("email", ""), personal.get("linkedin", "")] if x]
+        x for x in (personal.get("city", ""), personal.get("phone", ""), personal.get("email", ""), personal.get("linkedin", "")) if x
     )
 
-    story.append(Paragraph(full_name, title_style))
+    story.append(Paragraph(_esc(full_name), title_style))
     if contact_line:
-        story.append(Paragraph(contact_line, body_style))
+        story.append(_plain_line(contact_line, body_style))
         story.append(Spacer(1, 8))
 
-    summary = (cv.get("summary", "") or "").strip()
-    if summary:
-        story.append(Paragraph("Profil", section_style))
-        story.append(Paragraph(summary, body_style))
+    # Each section is looked up once; missing, empty or malformed sections skip all flowable work.
+    if (summary := src.get("summary")) and isinstance(summary, str) and (summary := summary.strip()):
+        story.append(_section_header(template_name, "Profil"))
+        story.append(Paragraph(_esc(summary), body_style))
 
-    experience = cv.get("experience", []) if isinstance(cv.get("experience"), list) else []
-    if experience:
-        story.append(Paragraph("Experiences", section_style))
+    if (experience := src.get("experience")) and isinstance(experience, list):
+        story.append(_section_header(template_name, "Experiences"))
         for exp in experience:
-            line = f"<b>{exp.get('title', '')}</b> - {exp.get('company', '')}"
-            dates = f"{exp.get('startDate', '')} - {exp.get('endDate', '')}".strip(" -")
-            location = exp.get("location", "")
-            details = " | ".join([x for x in [location, dates] if x])
-            story.append(Paragraph(line, body_style))
+            title_text, company, start_date, end_date, location, bullets = (exp.get(k, "") for k in _EXPERIENCE_FIELDS)
+            line = f"<b>{_esc(title_text)}</b> - {_esc(company)}"
+            dates = f"{start_date} - {end_date}".strip(" -")
+            details = " | ".join(x for x in (location, dates) if x)
+            # One paragraph per entry: header, details and bullets share a single markup parse.
+            parts = [line]
             if details:
-                story.append(Paragraph(details, body_style))
-            bullets = exp.get("bullets", []) if isinstance(exp.get("bullets"), list) else []
-            for bullet in bullets:
-                story.append(Paragraph(f"• {bullet}", body_style))
+                parts.append(_esc(details))
+            bullets = bullets or []
+            if not isinstance(bullets, list):
+                bullets = []
+            parts.extend(f"\u2022 {_esc(bullet)}" for bullet in bullets)
+            story.append(Paragraph("<br/>".join(parts), body_style))
             story.append(Spacer(1, 4))
 
-    skills = cv.get("skills", []) if isinstance(cv.get("skills"), list) else []
-    if skills:
-        story.append(Paragraph("Competences", section_style))
-        chips = ", ".join([str(s) for s in skills if str(s).strip()])
-        story.append(Paragraph(chips, body_style))
+    if (skills := src.get("skills")) and isinstance(skills, list):
+        story.append(_section_header(template_name, "Competences"))
+        chips = ", ".join(str(s) for s in skills if str(s).strip())
+        story.append(_plain_line(chips, body_style))
 
-    education = cv.get("education", []) if isinstance(cv.get("education"), list) else []
-    if education:
-        story.append(Paragraph("Formations", section_style))
-        rows = []
+    if (education := src.get("education")) and isinstance(education, list):
+        story.append(_section_header(template_name, "Formations"))
         for edu in education:
-            left = f"<b>{edu.get('degree', '')}</b><br/>{edu.get('school', '')}"
+            left = f"<b>{_esc(edu.get('degree', ''))}</b><br/>{_esc(edu.get('school', ''))}"
             right_parts = [edu.get("location", ""), f"{edu.get('startDate', '')} - {edu.get('endDate', '')}".strip(" -")]
-            right = "<br/>".join([p for p in right_parts if p])
-            rows.append([Paragraph(left, body_style), Paragraph(right, body_style)])
+            right = "<br/>".join(_esc(p) for p in right_parts if p)
             details = (edu.get("details", "") or "").strip()
             if details:
-                rows.append([Paragraph(details, body_style), Paragraph("", body_style)])
-
-        table = Table(rows, colWidths=[350, 170])
-        table.setStyle(
-            TableStyle(
-                [
-                    ("VALIGN", (0, 0), (-1, -1), "TOP"),
-                    ("LINEBELOW", (0, 0), (-1, -1), 0.25, palette["line"]),
-                    ("LEFTPADDING", (0, 0), (-1, -1), 0),
-                    ("RIGHTPADDING", (0, 0), (-1, -1), 0),
-                    ("TOPPADDING", (0, 0), (-1, -1), 3),
-                    ("BOTTOMPADDING", (0, 0), (-1, -1), 5),
-                ]
-            )
+                left = f"{left}<br/>{_esc(details)}"
+            story.append(_EducationRow(Paragraph(left, body_style), Paragraph(right, body_style), palette.line))
+
+    return story
+
+
+def _html_context(cv: dict, template_name: str, title: str) -> dict:
+    src = cv if isinstance(cv, dict) else {}
+    personal = src.get("personal") or {}
+    if not isinstance(personal, dict):
+        personal = {}
+    contact_line = " | ".join(
+        x for x in (personal.get("city", ""), personal.get("phone", ""), personal.get("email", ""), personal.get("linkedin", "")) if x
+    )
+
+    experience = []
+    for exp in src.get("experience") or []:
+        if not isinstance(exp, dict):
+            continue
+        dates = f"{exp.get('startDate', '')} - {exp.get('endDate', '')}".strip(" -")
+        bullets = exp.get("bullets") or []
+        experience.append(
+            {
+                "title": exp.get("title", ""),
+                "company": exp.get("company", ""),
+                "details": " | ".join(x for x in (exp.get("location", ""), dates) if x),
+                "bullets": bullets if isinstance(bullets, list) else [],
+            }
         )
-        story.append(table)
 
-    doc.build(story)
-    pdf = buffer.getvalue()
-    buffer.close()
-    return pdf
+    education = []
+    for edu in src.get("education") or []:
+        if not isinstance(edu, dict):
+            continue
+        education.append(
+            {
+                "degree": edu.get("degree", ""),
+                "school": edu.get("school", ""),
+                "details": (edu.get("details", "") or "").strip(),
+                "location": edu.get("location", ""),
+                "dates": f"{edu.get('startDate', '')} - {edu.get('endDate', '')}".strip(" -"),
+            }
+        )
+
+    skills = src.get("skills") or []
+    return {
+        "title": title,
+        "palette": PALETTE_HEX.get(template_name, PALETTE_HEX["simple"]),
+        "full_name": f"{personal.get('firstName', '')} {personal.get('lastName', '')}".strip() or title,
+        "contact_line": contact_line,
+        "summary": (src.get("summary", "") or "").strip(),
+        "experience": experience,
+        "skills": ", ".join(str(s) for s in skills if str(s).strip()) if isinstance(skills, list) else "",
+        "education": education,
+    }
+
+
+def build_cv_pdf_html(
+    cv: dict,
+    template_name: str = "simple",
+    title: str = "CV",
+    return_stream: bool = False,
+    out: BinaryIO | None = None,
+) -> bytes | BytesIO | None:
+    # Django caches the compiled template, so each call is one context render plus a single
+    # WeasyPrint layout pass, which amortizes better than Platypus flowables for bulk exports.
+    try:
+        from weasyprint import HTML
+    except Exception as exc:
+        raise ValueError("Missing dependency: weasyprint. Install it to use CV_PDF_BACKEND=html") from exc
+    from django.template.loader import get_template
+
+    html = get_template("cv_manager/cv_pdf.html").render(_html_context(cv, template_name, title))
+    document = HTML(string=html)
+    if out is not None:
+        document.write_pdf(out)
+        return None
+    if return_stream:
+        buffer = BytesIO()
+        document.write_pdf(buffer)
+        buffer.seek(0)
+        return buffer
+    return document.write_pdf()
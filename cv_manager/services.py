@@ -1,12 +1,34 @@
-﻿import base64
+﻿import atexit
+import base64
 import json
 import os
 import re
+import threading
 import unicodedata
 import zipfile
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import lru_cache, partial
 from io import BytesIO
+from itertools import repeat
+from typing import BinaryIO, Callable
 from xml.etree import ElementTree
 
+try:
+    # Optional: faster parsing of LLM JSON replies, same dict/list output.
+    import orjson
+except ImportError:
+    orjson = None
+
+# PDFs with at least this many pages are extracted across processes (0, the default, disables).
+PDF_EXTRACT_PARALLEL_PAGES = int(os.getenv("CV_PDF_EXTRACT_PARALLEL_PAGES", "0"))
+# Size of the process pool shared by all requests of a web worker.
+PDF_EXTRACT_MAX_WORKERS = int(os.getenv("CV_PDF_EXTRACT_MAX_WORKERS", "4"))
+# Query Google and OpenAI at the same time and keep the first answer (both may be billed).
+RACE_LLMS = os.getenv("CV_RACE_LLMS", "False").lower() == "true"
+# Start the Document AI fallback alongside local extraction instead of after it (billed per upload).
+SPECULATIVE_DOCUMENT_AI = os.getenv("CV_SPECULATIVE_DOCUMENT_AI", "False").lower() == "true"
+
 SECTION_HEADERS = {
     "summary": [
         "profil",
@@ -44,7 +66,7 @@ SECTION_HEADERS = {
     ],
 }
 
-TECHNICAL_NOISE_TERMS = {
+TECHNICAL_NOISE_TERMS = frozenset({
     "x11",
     "skia",
     "font",
@@ -71,7 +93,7 @@ TECHNICAL_NOISE_TERMS = {
     "mozilla",
     "webkit",
     "chrome",
-}
+})
 
 MONTH_TOKENS = (
     "jan",
@@ -95,9 +117,6 @@ MONTH_TOKENS = (
     "juil",
     "aout",
     "sept",
-    "oct",
-    "nov",
-    "dec",
 )
 
 TITLE_HINTS = (
@@ -128,6 +147,8 @@ DEGREE_HINTS = (
     "ingenieur",
 )
 
+SCHOOL_HINTS = ("universite", "university", "ecole", "school", "institut", "lycee", "college")
+
 CITY_HINT_WORDS = (
     "paris",
     "lyon",
@@ -144,7 +165,9 @@ CITY_HINT_WORDS = (
     "bruxelles",
 )
 
-SKILL_HINT_TOKENS = {
+# Matched as whole tokens (split on separators/whitespace): short names such as
+# "c" or "go" would otherwise hit inside ordinary words.
+SKILL_HINT_TOKENS = frozenset({
     "python",
     "django",
     "fastapi",
@@ -173,57 +196,167 @@ SKILL_HINT_TOKENS = {
     "c#",
     "go",
     "rust",
+})
+
+
+_W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_W_P = _W_NS + "p"
+_W_T = _W_NS + "t"
+
+# Leading bullet markers dropped from highlight and skill lines (one marker, then
+# whatever whitespace follows it).
+_BULLETS = "-•*"
+
+_READABLE_EXTRA = frozenset(" .,@:+-_/|()'")
+# ASCII bytes deleted by bytes.translate to count alphanumeric / readable characters.
+_ASCII_NON_ALNUM = bytes(c for c in range(128) if not chr(c).isalnum())
+_ASCII_NON_READABLE = bytes(c for c in range(128) if not (chr(c).isalnum() or chr(c) in _READABLE_EXTRA))
+
+_RE_WS = re.compile(r"\s+")
+_RE_WORD = re.compile(r"[a-z0-9_]+")
+_RE_MULTI_SPACE = re.compile(r"\s{2,}")
+_RE_HEX_BLOB = re.compile(r"[A-Fa-f0-9]{10,}")
+_RE_EMAIL_LIKE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+")
+_RE_EMAIL = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+_RE_PHONE = re.compile(r"(?:\+?\d[\d\s().-]{7,}\d)")
+_RE_LINKEDIN = re.compile(r"(?:https?://)?(?:www\.)?linkedin\.com/[^\s]+", re.IGNORECASE)
+_RE_LINKEDIN_LABEL = re.compile(r"(?i)linkedin\s*[:\-]\s*([^\n]+)")
+_RE_X11_GECKO = re.compile(r"\b(?:x11|skia|khtml|gecko|x86_64)\b")
+_RE_YEAR = re.compile(r"\b(?:19|20)\d{2}\b")
+# Contact anchors in one alternation. Years are searched separately (see _scan_anchors):
+# as a branch here they lose to phone matches such as "09.2019 - 06.2021".
+_RE_ANCHORS = re.compile(
+    r"(?P<email>[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,})"
+    r"|(?P<linkedin>(?:https?://)?(?:www\.)?linkedin\.com/[^\s]+)"
+    r"|(?P<phone>\+?\d[\d\s().-]{7,}\d)",
+    re.IGNORECASE,
+)
+_RE_YEAR_ONLY = re.compile(r"(?:19|20)\d{2}")
+# Entry heads are split once (maxsplit=2) into title / company / location. A single
+# fullmatch with named groups needs lazy groups that backtrack and is slower than split.
+_RE_ENTRY_HEAD = re.compile(r"\s+\|\s+|\s+-\s+|\s+@\s+")
+_RE_EDU_HEAD = re.compile(r"\s+\|\s+|\s+-\s+")
+_RE_SKILLS_PREFIX = re.compile(r"^(skills|competences|competence|technologies|outils)\s*[:\-]\s*", re.IGNORECASE)
+_RE_SKILLS_SPLIT = re.compile(r"[,;/|]")
+# Hint tuples are matched as plain substrings, like the former any(h in low ...) scans.
+_RE_TITLE = re.compile("|".join(map(re.escape, TITLE_HINTS)))
+_RE_DEGREE = re.compile("|".join(map(re.escape, DEGREE_HINTS)))
+_RE_CITY_WORDS = re.compile("|".join(map(re.escape, CITY_HINT_WORDS)))
+_RE_SCHOOL = re.compile("|".join(map(re.escape, SCHOOL_HINTS)))
+_RE_SUMMARY_NOISE = re.compile("x11|skia|khtml|pdf|gecko|x86_64")
+_RE_DATE = re.compile(r"\b(?:(?P<month>(?:" + "|".join(MONTH_TOKENS) + r")[a-z]*)\s+)?(?P<year>(?:19|20)\d{2})\b")
+_RE_CURRENT = re.compile("present|current|aujourd|maintenant|en cours")
+# 2 to 4 letter runs of at least two letters each, separated (and optionally
+# surrounded) by non-letters.
+_RE_NAME_LINE = re.compile(r"[^A-Za-zÀ-ÿ]*[A-Za-zÀ-ÿ]{2,}(?:[^A-Za-zÀ-ÿ]+[A-Za-zÀ-ÿ]{2,}){1,3}[^A-Za-zÀ-ÿ]*")
+_RE_LOCATION_ICONS = re.compile(r"[📍🏠⌂📌🗺]")
+_RE_LOCATION_WORD = re.compile(r"\b(?:ville|city|adresse|location)\b")
+_RE_LOCATION_LABEL = re.compile(r"(?i)^(ville|city|adresse|location)\s*[:\-]\s*")
+_RE_NON_ALPHA = re.compile(r"[^A-Za-z]+")
+_RE_CTRL = re.compile(r"[\x00-\x08\x0b-\x1f]+")
+_RE_HAS_ALNUM = re.compile(r"[A-Za-z0-9@]")
+_RE_JSON_FENCE = re.compile(r"```(?:json)?\s*(.*?)\s*(?:```|$)", re.DOTALL | re.IGNORECASE)
+_RE_PDF_STRING = re.compile(r"\(([^()]*)\)")
+_RE_PDF_ESCAPE = re.compile(r"\\[nrt]")
+_RE_PDF_OCTAL = re.compile(r"\\\d{3}")
+
+
+def _header_pattern(aliases: list[str]) -> re.Pattern:
+    # An alias matches as a whole space-delimited phrase anywhere in the line,
+    # or directly followed by ":" at the start ("competences: python, ...").
+    alternation = "|".join(re.escape(alias) for alias in sorted(aliases, key=len, reverse=True))
+    return re.compile(rf"^(?:{alternation}):|(?:^| )(?:{alternation})(?: |$)")
+
+
+# One compiled pattern per section, kept in SECTION_HEADERS order so the first
+# matching section still wins when a line mentions several.
+_HEADER_PATTERNS = tuple((section, _header_pattern(aliases)) for section, aliases in SECTION_HEADERS.items())
+
+
+def _strip_accents(text: str) -> str:
+    normalized = unicodedata.normalize("NFD", text)
+    return "".join(ch for ch in normalized if unicodedata.category(ch) != "Mn")
+
+
+# Precomposed Latin letters mapped to their unaccented form, so that typical French or
+# Spanish CV text is folded by one str.translate instead of NFD plus a per-character scan.
+_ACCENT_TABLE = {
+    cp: folded
+    for cp in (*range(0x80, 0x250), *range(0x1E00, 0x1F00))
+    if (folded := _strip_accents(chr(cp))) != chr(cp)
 }
 
 
 def _normalize_text(text: str) -> str:
-    normalized = unicodedata.normalize("NFD", text)
-    return "".join(ch for ch in normalized if unicodedata.category(ch) != "Mn")
+    # Plain ASCII has nothing to decompose.
+    if text.isascii():
+        return text
+    folded = text.translate(_ACCENT_TABLE)
+    if folded.isascii():
+        return folded
+    # Combining marks or scripts outside the table.
+    return _strip_accents(folded)
 
 
+@lru_cache(maxsize=4096)
 def _match_text(text: str) -> str:
     return _normalize_text(text).lower().strip()
 
 
+def _strip_bullet(line: str) -> str:
+    return (line[1:] if line[:1] in _BULLETS else line).strip()
+
+
 def _is_noise_line(line: str) -> bool:
     raw = line.strip()
     if not raw:
         return True
 
-    norm = _match_text(raw)
-
-    if re.fullmatch(r"[A-Fa-f0-9]{10,}", raw):
-        return True
-
-    technical_hits = sum(1 for token in TECHNICAL_NOISE_TERMS if token in norm)
-    if technical_hits >= 2 and not re.search(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+", raw):
+    if _RE_HEX_BLOB.fullmatch(raw):
         return True
 
-    if re.search(r"\b(?:x11|skia|khtml|gecko|x86_64)\b", norm):
-        return True
-
-    if len(raw) > 5:
-        alpha_num = sum(ch.isalnum() for ch in raw)
-        ratio = alpha_num / len(raw)
-        if ratio < 0.45:
+    length = len(raw)
+    if length > 5:
+        # Alphanumerics, and "readable" characters (alphanumerics plus common CV
+        # punctuation). ASCII lines are counted with bytes.translate deletions in C;
+        # other lines fall back to one Python pass.
+        if raw.isascii():
+            data = raw.encode("ascii")
+            alpha_num = len(data.translate(None, _ASCII_NON_ALNUM))
+            readable_chars = len(data.translate(None, _ASCII_NON_READABLE))
+        else:
+            alpha_num = 0
+            readable_chars = 0
+            for ch in raw:
+                if ch.isalnum():
+                    alpha_num += 1
+                    readable_chars += 1
+                elif ch in _READABLE_EXTRA:
+                    readable_chars += 1
+        if alpha_num / length < 0.45:
+            return True
+        # Heuristic: mostly non-readable symbols/gibberish.
+        if length >= 20 and readable_chars / length < 0.55:
+            return True
+        if length > 140 and not _RE_YEAR.search(raw):
             return True
 
-    if len(raw) > 140 and not re.search(r"\b(19|20)\d{2}\b", raw):
+    norm = _match_text(raw)
+    if _RE_X11_GECKO.search(norm):
         return True
 
-    # Heuristic: mostly non-readable symbols/gibberish.
-    readable_chars = sum(ch.isalnum() or ch in " .,@:+-_/|()'" for ch in raw)
-    if len(raw) >= 20 and (readable_chars / len(raw)) < 0.55:
+    technical_hits = len(TECHNICAL_NOISE_TERMS.intersection(_RE_WORD.findall(norm)))
+    if technical_hits >= 2 and not _RE_EMAIL_LIKE.search(raw):
         return True
 
     return False
 
 
-def _is_good_summary_line(line: str) -> bool:
+def _is_good_summary_line(line: str, norm: str | None = None) -> bool:
     if _is_noise_line(line):
         return False
-    low = _match_text(line)
-    if any(t in low for t in ("x11", "skia", "khtml", "pdf", "gecko", "x86_64")):
+    low = _match_text(line) if norm is None else norm
+    if _RE_SUMMARY_NOISE.search(low):
         return False
     if "@" in line:
         return False
@@ -236,26 +369,23 @@ def _looks_like_name_line(line: str) -> bool:
     s = line.strip()
     if len(s) > 60 or "@" in s or any(ch.isdigit() for ch in s):
         return False
-    parts = [p for p in re.split(r"[^A-Za-zÀ-ÿ]+", s) if p]
-    if len(parts) < 2 or len(parts) > 4:
-        return False
-    return all(len(p) >= 2 for p in parts)
+    return _RE_NAME_LINE.fullmatch(s) is not None
 
 
-def _extract_city_from_lines(lines: list[str]) -> str:
-    for line in lines[:15]:
+def _extract_city_from_lines(lines: list[str], norms: list[str] | None = None) -> str:
+    for i, line in enumerate(lines[:15]):
         raw = line.strip()
-        low = _match_text(raw)
+        low = _match_text(raw) if norms is None else norms[i]
         # Location markers often used in CV headers.
         if any(icon in raw for icon in ("📍", "🏠", "⌂", "📌", "🗺")):
-            cleaned = re.sub(r"[📍🏠⌂📌🗺]", " ", raw).strip(" :-|")
-            cleaned = re.sub(r"\s{2,}", " ", cleaned).strip()
+            cleaned = _RE_LOCATION_ICONS.sub(" ", raw).strip(" :-|")
+            cleaned = _RE_MULTI_SPACE.sub(" ", cleaned).strip()
             if cleaned:
                 return cleaned
-        if any(w in low for w in CITY_HINT_WORDS):
+        if _RE_CITY_WORDS.search(low):
             return raw
-        if re.search(r"\b(?:ville|city|adresse|location)\b", low):
-            cleaned = re.sub(r"(?i)^(ville|city|adresse|location)\s*[:\-]\s*", "", raw).strip()
+        if _RE_LOCATION_WORD.search(low):
+            cleaned = _RE_LOCATION_LABEL.sub("", raw).strip()
             if cleaned:
                 return cleaned
         if "," in raw and len(raw.split()) <= 8 and not any(ch.isdigit() for ch in raw):
@@ -267,10 +397,10 @@ def _extract_city_from_lines(lines: list[str]) -> str:
 
 
 def _extract_linkedin_fallback(text: str) -> str:
-    match = re.search(r"(?:https?://)?(?:www\.)?linkedin\.com/[^\s]+", text, flags=re.IGNORECASE)
+    match = _RE_LINKEDIN.search(text)
     if match:
         return match.group(0)
-    label = re.search(r"(?i)linkedin\s*[:\-]\s*([^\n]+)", text)
+    label = _RE_LINKEDIN_LABEL.search(text)
     if label:
         value = label.group(1).strip()
         if value:
@@ -284,16 +414,15 @@ def clean_extracted_text(text: str) -> str:
     last = ""
 
     for line in text.split("\n"):
-        compact = re.sub(r"\s+", " ", line).strip()
+        compact = _RE_WS.sub(" ", line).strip()
         if not compact:
             if out and out[-1] != "":
                 out.append("")
             continue
 
-        if _is_noise_line(compact):
-            continue
-
-        if compact == last:
+        # Only consecutive duplicates: the same line further apart is usually real content
+        # (two jobs in the same city); running page headers are removed by the PDF extractor.
+        if compact == last or _is_noise_line(compact):
             continue
 
         out.append(compact)
@@ -305,34 +434,165 @@ def clean_extracted_text(text: str) -> str:
     return "\n".join(out)
 
 
-def extract_text_from_pdf(file_bytes: bytes) -> str:
+def _as_stream(file_data: bytes | BinaryIO) -> BinaryIO:
+    # Uploads are passed as file objects (spooled to disk by Django when large).
+    if isinstance(file_data, (bytes, bytearray, memoryview)):
+        return BytesIO(file_data)
+    file_data.seek(0)
+    return file_data
+
+
+def _as_bytes(file_data: bytes | BinaryIO) -> bytes:
+    if isinstance(file_data, (bytes, bytearray, memoryview)):
+        return bytes(file_data)
+    file_data.seek(0)
+    return file_data.read()
+
+
+def extract_text_from_pdf(file_data: bytes | BinaryIO) -> str:
     try:
         from pypdf import PdfReader
     except ImportError:
-        return _extract_text_from_pdf_fallback(file_bytes)
+        return _extract_text_from_pdf_fallback(_as_bytes(file_data))
+
+    # pypdf seeks into the stream as pages are read instead of loading the whole file.
+    reader = PdfReader(_as_stream(file_data))
+    page_count = len(reader.pages)
+    pages_text = None
+    if PDF_EXTRACT_PARALLEL_PAGES and page_count >= PDF_EXTRACT_PARALLEL_PAGES:
+        pages_text = _extract_pdf_pages_parallel(_as_bytes(file_data), page_count)
+    if pages_text is None:
+        pages_text = [(page.extract_text() or "") for page in reader.pages]
+    raw = "\n".join(_strip_page_furniture(pages_text)).strip()
+    return clean_extracted_text(raw)
+
+
+# Lines within this many non-empty lines of a page's top or bottom can be page furniture.
+_PAGE_EDGE_LINES = 2
+
+
+def _strip_page_furniture(pages_text: list[str]) -> list[str]:
+    # Running headers/footers: the same line at the same distance from the top (or the
+    # bottom) of at least two pages and of at least half of them. Its first occurrence
+    # is kept (often the candidate's name), later copies at that position are dropped.
+    # A second line only counts when the outermost line of that page edge is furniture
+    # too, and lines away from the page edges are never touched.
+    if len(pages_text) < 2:
+        return pages_text
+
+    pages = [[_RE_WS.sub(" ", line).strip() for line in text.split("\n")] for text in pages_text]
+    # Per page: line index -> edge slot (0, 1 from the top; -1, -2 from the bottom).
+    # The edges of short pages are narrowed so they never overlap.
+    slots: list[dict[int, int]] = []
+    counts: Counter[tuple[int, str]] = Counter()
+    for lines in pages:
+        filled = [i for i, line in enumerate(lines) if line]
+        depth = min(_PAGE_EDGE_LINES, len(filled) // 2)
+        page_slots = {filled[k]: k for k in range(depth)}
+        page_slots.update({filled[-1 - k]: -1 - k for k in range(depth)})
+        slots.append(page_slots)
+        counts.update({(slot, lines[i]) for i, slot in page_slots.items()})
+
+    threshold = max(2, -(-len(pages) // 2))
+    furniture = {key for key, count in counts.items() if count >= threshold}
+    if not furniture:
+        return pages_text
+
+    seen: set[tuple[int, str]] = set()
+    cleaned: list[str] = []
+    for lines, page_slots in zip(pages, slots):
+        outer = {slot: (slot, lines[i]) in furniture for i, slot in page_slots.items() if slot in (0, -1)}
+        kept = []
+        for i, line in enumerate(lines):
+            slot = page_slots.get(i)
+            key = (slot, line) if slot is not None else None
+            if key in furniture and outer.get(0 if slot >= 0 else -1):
+                if key in seen:
+                    continue
+                seen.add(key)
+            kept.append(line)
+        cleaned.append("\n".join(kept))
+    return cleaned
+
+
+def _extract_pdf_pages(file_bytes: bytes, start: int, stop: int) -> list[str]:
+    # Runs in a worker process: pypdf readers are neither picklable nor thread-safe,
+    # so each worker opens its own reader on the same bytes.
+    from pypdf import PdfReader
 
     reader = PdfReader(BytesIO(file_bytes))
-    raw = "\n".join((page.extract_text() or "") for page in reader.pages).strip()
-    return clean_extracted_text(raw)
+    return [(reader.pages[i].extract_text() or "") for i in range(start, stop)]
+
+
+_PDF_POOL = None
+_PDF_POOL_LOCK = threading.Lock()
+
+
+def _pdf_extract_pool(workers: int):
+    # One pool per web worker, created on first use and reused, so concurrent requests
+    # share PDF_EXTRACT_MAX_WORKERS processes. Workers are started by a fork server
+    # (or spawned) rather than forked from a process that runs SDK threads.
+    global _PDF_POOL
+    with _PDF_POOL_LOCK:
+        if _PDF_POOL is None:
+            # Imported here: concurrent.futures.process pulls in multiprocessing at boot otherwise.
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _PDF_POOL = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method))
+            atexit.register(_PDF_POOL.shutdown)
+        return _PDF_POOL
+
+
+def _discard_pdf_extract_pool(pool) -> None:
+    global _PDF_POOL
+    with _PDF_POOL_LOCK:
+        if _PDF_POOL is pool:
+            _PDF_POOL = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _extract_pdf_pages_parallel(file_bytes: bytes, page_count: int) -> list[str] | None:
+    # Page text reconstruction is CPU-bound Python, so long PDFs are split into
+    # contiguous page ranges across processes. None means "do it serially".
+    workers = min(PDF_EXTRACT_MAX_WORKERS, os.cpu_count() or 1, page_count)
+    if workers < 2:
+        return None
+    from concurrent.futures.process import BrokenProcessPool
+
+    size = -(-page_count // workers)
+    starts = range(0, page_count, size)
+    stops = [min(start + size, page_count) for start in starts]
+    pool = None
+    try:
+        pool = _pdf_extract_pool(min(PDF_EXTRACT_MAX_WORKERS, os.cpu_count() or 1))
+        results = pool.map(_extract_pdf_pages, repeat(file_bytes), starts, stops)
+        return [text for chunk in results for text in chunk]
+    except (OSError, BrokenProcessPool):
+        # Sandboxed runtimes without multiprocessing support, or a crashed worker.
+        if pool is not None:
+            _discard_pdf_extract_pool(pool)
+        return None
 
 
 def _extract_text_from_pdf_fallback(file_bytes: bytes) -> str:
     decoded = file_bytes.decode("latin-1", errors="ignore")
-    chunks = re.findall(r"\(([^()]*)\)", decoded)
+    chunks = _RE_PDF_STRING.findall(decoded)
     cleaned: list[str] = []
 
     for chunk in chunks:
-        line = re.sub(r"\\[nrt]", " ", chunk)
-        line = re.sub(r"\\\d{3}", "", line)
-        line = re.sub(r"\s{2,}", " ", line).strip()
+        line = _RE_PDF_ESCAPE.sub(" ", chunk)
+        line = _RE_PDF_OCTAL.sub("", line)
+        line = _RE_MULTI_SPACE.sub(" ", line).strip()
         if line and not _is_noise_line(line):
             cleaned.append(line)
 
     return clean_extracted_text("\n".join(cleaned))
 
 
-def extract_text_from_docx(file_bytes: bytes) -> str:
-    direct = _extract_text_from_docx_zip(file_bytes)
+def extract_text_from_docx(file_data: bytes | BinaryIO) -> str:
+    direct = _extract_text_from_docx_zip(file_data)
     if direct:
         return clean_extracted_text(direct)
 
@@ -341,17 +601,14 @@ def extract_text_from_docx(file_bytes: bytes) -> str:
     except ImportError as exc:
         raise ValueError("Missing dependency: python-docx. Install requirements.txt") from exc
 
-    document = Document(BytesIO(file_bytes))
+    document = Document(_as_stream(file_data))
     raw = "\n".join(p.text for p in document.paragraphs if p.text and p.text.strip()).strip()
     return clean_extracted_text(raw)
 
 
-def _extract_text_from_docx_zip(file_bytes: bytes) -> str:
-    if not zipfile.is_zipfile(BytesIO(file_bytes)):
-        return ""
-
+def _extract_text_from_docx_zip(file_data: bytes | BinaryIO) -> str:
     try:
-        with zipfile.ZipFile(BytesIO(file_bytes)) as zf:
+        with zipfile.ZipFile(_as_stream(file_data)) as zf:
             names = zf.namelist()
             if "word/document.xml" not in names:
                 return ""
@@ -362,60 +619,122 @@ def _extract_text_from_docx_zip(file_bytes: bytes) -> str:
 
             blocks: list[str] = []
             for part in xml_parts:
-                xml_data = zf.read(part)
-                root = ElementTree.fromstring(xml_data)
-                ns = {"w": "http://schemas.openxmlformats.org/wordprocessingml/2006/main"}
-
-                for paragraph in root.findall(".//w:p", ns):
-                    runs = [t.text or "" for t in paragraph.findall(".//w:t", ns)]
-                    line = "".join(runs).strip()
-                    if line:
-                        blocks.append(line)
+                # Stream the part: text runs are buffered until their paragraph closes.
+                runs: list[str] = []
+                with zf.open(part) as fh:
+                    for _, elem in ElementTree.iterparse(fh, events=("end",)):
+                        if elem.tag == _W_T:
+                            runs.append(elem.text or "")
+                        elif elem.tag == _W_P:
+                            line = "".join(runs).strip()
+                            if line:
+                                blocks.append(line)
+                            runs.clear()
+                            elem.clear()
             return "\n".join(blocks).strip()
     except Exception:
+        # Not a zip archive (BadZipFile) or malformed XML.
         return ""
 
 
 def extract_text_from_doc(file_bytes: bytes) -> str:
-    candidates: list[str] = []
-    for encoding in ("utf-16-le", "cp1252", "latin-1"):
-        try:
-            decoded = file_bytes.decode(encoding, errors="ignore")
-        except Exception:
-            continue
-        cleaned = _clean_legacy_doc_text(decoded)
-        if cleaned:
-            candidates.append(cleaned)
+    # Decode once: UTF-16 when the BOM says so, otherwise cp1252 (Word 97 text
+    # pieces), with latin-1 only as a fallback when cp1252 yields almost nothing.
+    if file_bytes[:2] == b"\xff\xfe":
+        cleaned = _clean_legacy_doc_text(file_bytes[2:].decode("utf-16-le", errors="ignore"))
+    else:
+        cleaned = _clean_legacy_doc_text(file_bytes.decode("cp1252", errors="ignore"))
+        if len(cleaned) < 200:
+            fallback = _clean_legacy_doc_text(file_bytes.decode("latin-1"))
+            if len(fallback) > len(cleaned):
+                cleaned = fallback
 
-    if not candidates:
+    if not cleaned:
         return ""
 
-    return clean_extracted_text(max(candidates, key=len))
+    return clean_extracted_text(cleaned)
 
 
 def _clean_legacy_doc_text(text: str) -> str:
-    text = re.sub(r"[\x00-\x08\x0b-\x1f]", " ", text)
-    lines = [re.sub(r"\s+", " ", ln).strip() for ln in text.splitlines()]
-    filtered = [ln for ln in lines if ln and re.search(r"[A-Za-z0-9@]", ln)]
-    merged = "\n".join(filtered)
-    merged = re.sub(r"[ \t]{2,}", " ", merged)
-    merged = re.sub(r"\n{3,}", "\n\n", merged)
-    return merged.strip()
+    # Lines are whitespace-collapsed and empty ones dropped, so no extra
+    # space-run / blank-line passes are needed on the merged text.
+    text = _RE_CTRL.sub(" ", text)
+    return "\n".join(
+        cleaned
+        for ln in text.splitlines()
+        if (cleaned := _RE_WS.sub(" ", ln).strip()) and _RE_HAS_ALNUM.search(cleaned)
+    )
+
+
+# SDK clients hold HTTP connection pools; build them once per API key instead of
+# per request. Import errors are not cached, callers map them as before.
+@lru_cache(maxsize=4)
+def _openai_client(api_key: str):
+    from openai import OpenAI
+
+    return OpenAI(api_key=api_key)
 
 
-def extract_text_from_image_with_ai(file_bytes: bytes, mime_type: str) -> str:
+# genai.configure() is process-global and drops the SDK's cached clients, so it only
+# runs when the key changes.
+@lru_cache(maxsize=1)
+def _genai_module(api_key: str):
+    import google.generativeai as genai
+
+    genai.configure(api_key=api_key)
+    return genai
+
+
+@lru_cache(maxsize=4)
+def _genai_model(api_key: str, model_name: str):
+    return _genai_module(api_key).GenerativeModel(model_name)
+
+
+_CV_FIELDS_PROMPT = (
+    "personal fields: firstName,lastName,email,phone,city,linkedin. "
+    "experience fields: title,company,location,startDate,endDate,bullets. "
+    "education fields: degree,school,location,startDate,endDate,details."
+)
+
+def extract_text_from_image_with_ai(
+    file_bytes: bytes, mime_type: str, language_hint: str | None = None
+) -> tuple[str, dict | None]:
+    # Returns the OCR text and, when the vision call also parsed the CV, the structured
+    # reply for parse_cv_text_with_ai (None otherwise).
     api_key = os.getenv("OPENAI_API_KEY", "").strip()
     if not api_key:
-        return ""
+        return "", None
 
     try:
-        from openai import OpenAI
+        client = _openai_client(api_key)
     except ImportError as exc:
         raise ValueError("Missing dependency: openai. Install requirements.txt") from exc
 
-    client = OpenAI(api_key=api_key)
-    image_b64 = base64.b64encode(file_bytes).decode("utf-8")
+    # Encode straight from a view of the upload; base64 output is pure ASCII.
+    image_url = f"data:{mime_type};base64," + base64.b64encode(memoryview(file_bytes)).decode("ascii")
+    ocr_instructions = "Extract all readable text from this CV image. Keep line breaks and section headers."
+
+    # Without a Google key the text would be parsed by OpenAI right after, so the
+    # vision call also returns the structured CV and saves that second round-trip.
+    if not _google_api_key():
+        hint = f"Language hint: {language_hint}. " if language_hint else ""
+        instructions = (
+            f"{hint}{ocr_instructions} "
+            "Return ONLY JSON with keys: raw_text (the extracted text) and cv. "
+            "cv keys: personal, summary, skills, experience, education. "
+            f"{_CV_FIELDS_PROMPT} "
+            "If information is missing, return empty strings or empty arrays. Do not invent data."
+        )
+        payload = _safe_json_loads(_openai_image_request(client, image_url, instructions, "json_object"))
+        if isinstance(payload, dict) and isinstance(payload.get("raw_text"), str):
+            parsed = payload.get("cv")
+            return clean_extracted_text(payload["raw_text"]), (parsed if isinstance(parsed, dict) and parsed else None)
+        # Unusable JSON: a plain OCR call rather than returning the reply as CV text.
+
+    return clean_extracted_text(_openai_image_request(client, image_url, ocr_instructions, "text")), None
+
 
+def _openai_image_request(client, image_url: str, instructions: str, format_type: str) -> str:
     response = client.responses.create(
         model="gpt-4.1-mini",
         input=[
@@ -424,34 +743,38 @@ def extract_text_from_image_with_ai(file_bytes: bytes, mime_type: str) -> str:
                 "content": [
                     {
                         "type": "input_text",
-                        "text": "Extract all readable text from this CV image. Keep line breaks and section headers.",
+                        "text": instructions,
                     },
                     {
                         "type": "input_image",
-                        "image_url": f"data:{mime_type};base64,{image_b64}",
+                        "image_url": image_url,
                     },
                 ],
             }
         ],
+        text={"format": {"type": format_type}},
     )
-    return clean_extracted_text((response.output_text or "").strip())
+    return (response.output_text or "").strip()
+
+
+def _google_api_key() -> str:
+    return os.getenv("GOOGLE_API_KEY", "").strip() or os.getenv("GEMINI_API_KEY", "").strip()
 
 
 def _extract_text_with_google_document_ai(file_bytes: bytes, mime_type: str) -> str:
-    api_key = os.getenv("GOOGLE_API_KEY", "").strip() or os.getenv("GEMINI_API_KEY", "").strip()
+    api_key = _google_api_key()
     if not api_key:
         return ""
     try:
-        import google.generativeai as genai
+        genai = _genai_module(api_key)
     except Exception:
         return ""
 
     try:
-        genai.configure(api_key=api_key)
-        model_name = _select_google_model_for_generate_content(genai)
+        model_name = _select_google_model_for_generate_content(genai, api_key)
         if not model_name:
             return ""
-        model = genai.GenerativeModel(model_name)
+        model = _genai_model(api_key, model_name)
         prompt = (
             "Extract all readable text from this CV document. "
             "Keep line breaks and section headers. Return plain text only."
@@ -467,7 +790,16 @@ def _extract_text_with_google_document_ai(file_bytes: bytes, mime_type: str) ->
         return ""
 
 
-def _select_google_model_for_generate_content(genai_module) -> str:
+# Model picked per API key; list_models() is a network call, and its answer
+# does not change during the life of the process.
+_GOOGLE_MODEL_CACHE: dict[str, str] = {}
+
+
+def _select_google_model_for_generate_content(genai_module, api_key: str = "") -> str:
+    cached = _GOOGLE_MODEL_CACHE.get(api_key)
+    if cached:
+        return cached
+
     preferred = [
         "gemini-2.0-flash",
         "gemini-1.5-flash-latest",
@@ -481,26 +813,31 @@ def _select_google_model_for_generate_content(genai_module) -> str:
             methods = set(getattr(m, "supported_generation_methods", []) or [])
             if "generateContent" in methods:
                 available.append(name.replace("models/", ""))
-        if not available:
-            return preferred[0]
-        for candidate in preferred:
-            if candidate in available:
-                return candidate
-        return available[0]
     except Exception:
+        # Not cached: the listing may succeed on the next request.
         return preferred[0]
 
+    selected = available[0] if available else preferred[0]
+    for candidate in preferred:
+        if candidate in available:
+            selected = candidate
+            break
+    _GOOGLE_MODEL_CACHE[api_key] = selected
+    return selected
+
 
-def _is_low_quality_extraction(text: str) -> bool:
-    cleaned = clean_extracted_text(text)
+def _is_low_quality_extraction(text: str, *, already_cleaned: bool = False) -> bool:
+    cleaned = text if already_cleaned else clean_extracted_text(text)
     if not cleaned:
         return True
-    lines = [ln for ln in cleaned.splitlines() if ln.strip()]
+    # Cleaned text never has two blank lines in a row, so the first 12
+    # non-empty lines are within its first 24 lines.
+    lines = [ln for ln in cleaned.split("\n", 24)[:24] if ln.strip()][:12]
     if len(lines) < 3:
         return True
 
-    joined = _match_text(" ".join(lines[:12]))
-    noise_hits = sum(1 for token in TECHNICAL_NOISE_TERMS if token in joined)
+    joined = _match_text(" ".join(lines))
+    noise_hits = len(TECHNICAL_NOISE_TERMS.intersection(_RE_WORD.findall(joined)))
     has_cv_markers = any(
         k in joined
         for k in (
@@ -554,19 +891,82 @@ def strict_cv_template() -> dict:
     }
 
 
+# Output field -> accepted input keys, in priority order.
+_STRICT_PERSONAL_KEYS = {
+    "firstName": ("firstName", "first_name", "prenom"),
+    "lastName": ("lastName", "last_name", "nom"),
+    "email": ("email",),
+    "phone": ("phone", "telephone"),
+    "city": ("city", "location", "ville"),
+    "linkedin": ("linkedin",),
+}
+_STRICT_EXPERIENCE_KEYS = {
+    "title": ("title", "poste"),
+    "company": ("company", "entreprise"),
+    "location": ("location", "lieu"),
+    "startDate": ("startDate", "start_date", "date_debut"),
+    "endDate": ("endDate", "end_date", "date_fin"),
+}
+_STRICT_EDUCATION_KEYS = {
+    "degree": ("degree", "diplome"),
+    "school": ("school", "ecole", "universite"),
+    "location": ("location", "ville"),
+    "startDate": ("startDate", "start_date", "date_debut"),
+    "endDate": ("endDate", "end_date", "date_fin"),
+    "details": ("details", "description"),
+}
+# LLM replies use the camelCase names from the prompts; legacy snake_case and French
+# names are still accepted.
+_LOCAL_PERSONAL_KEYS = {
+    "first_name": ("firstName", "first_name", "prenom"),
+    "last_name": ("lastName", "last_name", "nom"),
+    "email": ("email",),
+    "phone": ("phone", "telephone"),
+    "location": ("city", "location", "ville"),
+    "linkedin": ("linkedin",),
+}
+_LOCAL_EXPERIENCE_KEYS = {
+    "company": ("company", "entreprise"),
+    "title": ("title", "poste"),
+    "start_date": ("startDate", "start_date", "date_debut"),
+    "end_date": ("endDate", "end_date", "date_fin"),
+    "location": ("location", "lieu"),
+}
+_LOCAL_EDUCATION_KEYS = {
+    "school": ("school", "ecole", "universite"),
+    "degree": ("degree", "diplome"),
+    "field": ("field", "domaine"),
+    "location": ("location", "ville"),
+    "start_date": ("startDate", "start_date", "date_debut"),
+    "end_date": ("endDate", "end_date", "date_fin"),
+    "details": ("details", "description"),
+}
+# Top-level sections normalize_structured_cv reads from an LLM reply.
+_LLM_SECTION_KEYS = (
+    "personal", "personal_info", "infos_personnelles", "contact",
+    "summary", "resume", "profil",
+    "skills", "competences",
+    "experience", "experiences", "experience_professionnelle",
+    "education", "formation", "formations",
+)
+
+
+def _first_str(d: dict, keys: tuple[str, ...]) -> str:
+    for key in keys:
+        value = d.get(key)
+        if value:
+            return str(value)
+    return ""
+
+
 def to_strict_schema(cv: dict) -> dict:
     src = cv if isinstance(cv, dict) else {}
     out = strict_cv_template()
 
     personal_src = src.get("personal") or src.get("personal_info") or src.get("contact") or {}
-    first_name = str(personal_src.get("firstName") or personal_src.get("first_name") or personal_src.get("prenom") or "")
-    last_name = str(personal_src.get("lastName") or personal_src.get("last_name") or personal_src.get("nom") or "")
-    out["personal"]["firstName"] = first_name.strip().title()
-    out["personal"]["lastName"] = last_name.strip().upper()
-    out["personal"]["email"] = str(personal_src.get("email") or "")
-    out["personal"]["phone"] = str(personal_src.get("phone") or personal_src.get("telephone") or "")
-    out["personal"]["city"] = str(personal_src.get("city") or personal_src.get("location") or personal_src.get("ville") or "")
-    out["personal"]["linkedin"] = str(personal_src.get("linkedin") or "")
+    out["personal"] = {field: _first_str(personal_src, keys) for field, keys in _STRICT_PERSONAL_KEYS.items()}
+    out["personal"]["firstName"] = out["personal"]["firstName"].strip().title()
+    out["personal"]["lastName"] = out["personal"]["lastName"].strip().upper()
 
     out["summary"] = str(src.get("summary") or src.get("resume") or "")
 
@@ -582,32 +982,16 @@ def to_strict_schema(cv: dict) -> dict:
             bullets = e.get("bullets") or e.get("highlights") or e.get("missions") or []
             if not isinstance(bullets, list):
                 bullets = []
-            out["experience"].append(
-                {
-                    "title": str(e.get("title") or e.get("poste") or ""),
-                    "company": str(e.get("company") or e.get("entreprise") or ""),
-                    "location": str(e.get("location") or e.get("lieu") or ""),
-                    "startDate": str(e.get("startDate") or e.get("start_date") or e.get("date_debut") or ""),
-                    "endDate": str(e.get("endDate") or e.get("end_date") or e.get("date_fin") or ""),
-                    "bullets": [str(x).strip() for x in bullets if str(x).strip()],
-                }
-            )
+            entry = {field: _first_str(e, keys) for field, keys in _STRICT_EXPERIENCE_KEYS.items()}
+            entry["bullets"] = [str(x).strip() for x in bullets if str(x).strip()]
+            out["experience"].append(entry)
 
     edu_src = src.get("education") or src.get("formation") or src.get("formations") or []
     if isinstance(edu_src, list):
         for e in edu_src:
             if not isinstance(e, dict):
                 continue
-            out["education"].append(
-                {
-                    "degree": str(e.get("degree") or e.get("diplome") or ""),
-                    "school": str(e.get("school") or e.get("ecole") or e.get("universite") or ""),
-                    "location": str(e.get("location") or e.get("ville") or ""),
-                    "startDate": str(e.get("startDate") or e.get("start_date") or e.get("date_debut") or ""),
-                    "endDate": str(e.get("endDate") or e.get("end_date") or e.get("date_fin") or ""),
-                    "details": str(e.get("details") or e.get("description") or ""),
-                }
-            )
+            out["education"].append({field: _first_str(e, keys) for field, keys in _STRICT_EDUCATION_KEYS.items()})
 
     # Regex authority for reliable contacts.
     full_text = " ".join(
@@ -619,19 +1003,19 @@ def to_strict_schema(cv: dict) -> dict:
         ]
     )
     if not out["personal"]["email"]:
-        m = re.search(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}", full_text)
+        m = _RE_EMAIL.search(full_text)
         out["personal"]["email"] = m.group(0) if m else ""
     if not out["personal"]["phone"]:
-        m = re.search(r"(?:\+?\d[\d\s().-]{7,}\d)", full_text)
+        m = _RE_PHONE.search(full_text)
         out["personal"]["phone"] = m.group(0) if m else ""
     if not out["personal"]["linkedin"]:
-        m = re.search(r"(?:https?://)?(?:www\.)?linkedin\.com/[^\s]+", full_text, flags=re.IGNORECASE)
+        m = _RE_LINKEDIN.search(full_text)
         out["personal"]["linkedin"] = m.group(0) if m else ""
 
     # If name is still missing, infer from email local-part.
     if (not out["personal"]["firstName"] or not out["personal"]["lastName"]) and out["personal"]["email"]:
         local = out["personal"]["email"].split("@", 1)[0]
-        parts = [p for p in re.split(r"[^A-Za-z]+", local) if p]
+        parts = [p for p in _RE_NON_ALPHA.split(local) if p]
         if len(parts) >= 2:
             if not out["personal"]["firstName"]:
                 out["personal"]["firstName"] = parts[0].title()
@@ -641,15 +1025,21 @@ def to_strict_schema(cv: dict) -> dict:
     return out
 
 
+_EXPECTED_ROOT = frozenset({"personal", "summary", "skills", "experience", "education"})
+_EXPECTED_PERSONAL = frozenset({"firstName", "lastName", "email", "phone", "city", "linkedin"})
+_EXPECTED_EXPERIENCE = frozenset({"title", "company", "location", "startDate", "endDate", "bullets"})
+_EXPECTED_EDUCATION = frozenset({"degree", "school", "location", "startDate", "endDate", "details"})
+
+
 def validate_strict_schema(cv: dict) -> bool:
+    # Required keys must be present; extra keys are tolerated.
     if not isinstance(cv, dict):
         return False
-    expected_root = {"personal", "summary", "skills", "experience", "education"}
-    if set(cv.keys()) != expected_root:
+    if not _EXPECTED_ROOT <= cv.keys():
         return False
     if not isinstance(cv.get("personal"), dict):
         return False
-    if set(cv["personal"].keys()) != {"firstName", "lastName", "email", "phone", "city", "linkedin"}:
+    if not _EXPECTED_PERSONAL <= cv["personal"].keys():
         return False
     if not isinstance(cv.get("summary"), str):
         return False
@@ -662,54 +1052,63 @@ def validate_strict_schema(cv: dict) -> bool:
     for e in cv["experience"]:
         if not isinstance(e, dict):
             return False
-        if set(e.keys()) != {"title", "company", "location", "startDate", "endDate", "bullets"}:
+        if not _EXPECTED_EXPERIENCE <= e.keys():
             return False
         if not isinstance(e["bullets"], list):
             return False
     for e in cv["education"]:
         if not isinstance(e, dict):
             return False
-        if set(e.keys()) != {"degree", "school", "location", "startDate", "endDate", "details"}:
+        if not _EXPECTED_EDUCATION <= e.keys():
             return False
     return True
 
 
+def _json_loads(text: str):
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
 def _safe_json_loads(content: str) -> dict:
     text = (content or "").strip()
     if not text:
         return {}
     try:
-        return json.loads(text)
+        return _json_loads(text)
     except Exception:
         pass
 
     # Strip common markdown fences from LLM outputs.
-    text = re.sub(r"^```(?:json)?\s*", "", text, flags=re.IGNORECASE)
-    text = re.sub(r"\s*```$", "", text)
+    if "```" in text:
+        m = _RE_JSON_FENCE.search(text)
+        if m:
+            text = m.group(1)
 
     # Keep only the biggest JSON object block.
     start = text.find("{")
     end = text.rfind("}")
-    if start != -1 and end != -1 and end > start:
+    if start != -1 and end > start:
         text = text[start : end + 1]
     try:
-        return json.loads(text)
+        return _json_loads(text)
     except Exception:
         return {}
 
 
-def _normalize_personal_info(raw: dict, local: dict) -> dict:
+def _normalize_personal_info(raw: dict, local_cv: Callable[[], dict]) -> dict:
     source = raw if isinstance(raw, dict) else {}
-    fallback = local.get("personal_info", {}) if isinstance(local, dict) else {}
-
-    result = {
-        "first_name": str(source.get("first_name") or source.get("prenom") or fallback.get("first_name") or ""),
-        "last_name": str(source.get("last_name") or source.get("nom") or fallback.get("last_name") or ""),
-        "email": str(source.get("email") or fallback.get("email") or ""),
-        "phone": str(source.get("phone") or source.get("telephone") or fallback.get("phone") or ""),
-        "location": str(source.get("location") or source.get("ville") or fallback.get("location") or ""),
-        "linkedin": str(source.get("linkedin") or fallback.get("linkedin") or ""),
-    }
+    # The local fallback is only built for fields the LLM left empty.
+    fallback = None
+
+    result = {}
+    for field, keys in _LOCAL_PERSONAL_KEYS.items():
+        value = _first_str(source, keys)
+        if not value:
+            if fallback is None:
+                fallback = local_cv().get("personal_info") or {}
+            value = _first_str(fallback, (field,))
+        result[field] = value
     return result
 
 
@@ -717,11 +1116,17 @@ def _normalize_array(value) -> list:
     return value if isinstance(value, list) else []
 
 
-def normalize_structured_cv(raw: dict, local: dict | None = None) -> dict:
-    local = local or default_cv()
+def normalize_structured_cv(
+    raw: dict, local: dict | None = None, *, local_factory: Callable[[], dict] | None = None
+) -> dict:
+    # Fields the LLM left empty fall back to the local CV: `local`, or the result of
+    # local_factory(), called at most once and only when some field is actually missing.
+    local_cv = lru_cache(maxsize=None)(local_factory or (lambda: local if local is not None else default_cv()))
     src = raw if isinstance(raw, dict) else {}
 
-    personal_raw = src.get("personal_info") or src.get("infos_personnelles") or src.get("contact") or {}
+    personal_raw = (
+        src.get("personal") or src.get("personal_info") or src.get("infos_personnelles") or src.get("contact") or {}
+    )
     summary_raw = src.get("summary") or src.get("resume") or src.get("profil") or ""
     skills_raw = src.get("skills") or src.get("competences") or []
     exp_raw = src.get("experience") or src.get("experiences") or src.get("experience_professionnelle") or []
@@ -730,61 +1135,46 @@ def normalize_structured_cv(raw: dict, local: dict | None = None) -> dict:
     certs_raw = src.get("certifications") or src.get("certification") or []
 
     out = default_cv()
-    out["personal_info"] = _normalize_personal_info(personal_raw, local)
-    out["summary"] = str(summary_raw or local.get("summary") or "")
-    out["skills"] = [str(s).strip() for s in _normalize_array(skills_raw) if str(s).strip()] or local.get("skills", [])
+    out["personal_info"] = _normalize_personal_info(personal_raw, local_cv)
+    out["summary"] = str(summary_raw or local_cv().get("summary") or "")
+    out["skills"] = [str(s).strip() for s in _normalize_array(skills_raw) if str(s).strip()] or local_cv().get("skills", [])
 
     exp_list = []
     for e in _normalize_array(exp_raw):
         if not isinstance(e, dict):
             continue
-        exp_list.append(
-            {
-                "company": str(e.get("company") or e.get("entreprise") or ""),
-                "title": str(e.get("title") or e.get("poste") or ""),
-                "start_date": str(e.get("start_date") or e.get("date_debut") or ""),
-                "end_date": str(e.get("end_date") or e.get("date_fin") or ""),
-                "location": str(e.get("location") or e.get("lieu") or ""),
-                "highlights": [str(x).strip() for x in _normalize_array(e.get("highlights") or e.get("missions") or []) if str(x).strip()],
-            }
-        )
-    out["experience"] = exp_list or local.get("experience", [])
+        entry = {field: _first_str(e, keys) for field, keys in _LOCAL_EXPERIENCE_KEYS.items()}
+        bullets = e.get("bullets") or e.get("highlights") or e.get("missions") or []
+        entry["highlights"] = [str(x).strip() for x in _normalize_array(bullets) if str(x).strip()]
+        exp_list.append(entry)
+    out["experience"] = exp_list or local_cv().get("experience", [])
 
     edu_list = []
     for e in _normalize_array(edu_raw):
         if not isinstance(e, dict):
             continue
-        edu_list.append(
-            {
-                "school": str(e.get("school") or e.get("ecole") or e.get("universite") or ""),
-                "degree": str(e.get("degree") or e.get("diplome") or ""),
-                "field": str(e.get("field") or e.get("domaine") or ""),
-                "start_date": str(e.get("start_date") or e.get("date_debut") or ""),
-                "end_date": str(e.get("end_date") or e.get("date_fin") or ""),
-                "details": str(e.get("details") or e.get("description") or ""),
-            }
-        )
-    out["education"] = edu_list or local.get("education", [])
-    out["languages"] = _normalize_array(langs_raw) or local.get("languages", [])
-    out["certifications"] = _normalize_array(certs_raw) or local.get("certifications", [])
+        edu_list.append({field: _first_str(e, keys) for field, keys in _LOCAL_EDUCATION_KEYS.items()})
+    out["education"] = edu_list or local_cv().get("education", [])
+    # The local parser never fills languages or certifications, so there is nothing to fall back on.
+    out["languages"] = _normalize_array(langs_raw)
+    out["certifications"] = _normalize_array(certs_raw)
     return to_strict_schema(out)
 
 
 def _llm_parse_with_google(cleaned_text: str, language_hint: str | None) -> dict:
-    api_key = os.getenv("GOOGLE_API_KEY", "").strip() or os.getenv("GEMINI_API_KEY", "").strip()
+    api_key = _google_api_key()
     if not api_key:
         return {}
     try:
-        import google.generativeai as genai
+        genai = _genai_module(api_key)
     except Exception:
         return {}
 
     try:
-        genai.configure(api_key=api_key)
-        model_name = _select_google_model_for_generate_content(genai)
+        model_name = _select_google_model_for_generate_content(genai, api_key)
         if not model_name:
             return {}
-        model = genai.GenerativeModel(model_name)
+        model = _genai_model(api_key, model_name)
         hint = f"Language hint: {language_hint}." if language_hint else ""
         prompt = (
             f"{hint}\n"
@@ -808,11 +1198,10 @@ def _llm_parse_with_openai(cleaned_text: str, language_hint: str | None) -> dict
     if not api_key:
         return {}
     try:
-        from openai import OpenAI
+        client = _openai_client(api_key)
     except Exception:
         return {}
 
-    client = OpenAI(api_key=api_key)
     hint = f"Language hint from user: {language_hint}." if language_hint else ""
     schema = {
         "type": "object",
@@ -843,9 +1232,7 @@ def _llm_parse_with_openai(cleaned_text: str, language_hint: str | None) -> dict
                     "content": (
                         f"{hint}\n"
                         "Return ONLY JSON with keys: personal, summary, skills, experience, education. "
-                        "personal fields: firstName,lastName,email,phone,city,linkedin. "
-                        "experience fields: title,company,location,startDate,endDate,bullets. "
-                        "education fields: degree,school,location,startDate,endDate,details. "
+                        f"{_CV_FIELDS_PROMPT} "
                         f"Expected shape: {json.dumps(schema, ensure_ascii=True)}\n\n"
                         f"CV_TEXT:\n{cleaned_text}"
                     ),
@@ -860,25 +1247,26 @@ def _llm_parse_with_openai(cleaned_text: str, language_hint: str | None) -> dict
 def _detect_header(line: str) -> str | None:
     norm = _match_text(line)
     norm = norm.strip(" :-|\t")
-    norm = re.sub(r"\s+", " ", norm)
+    norm = _RE_WS.sub(" ", norm)
 
     if len(norm) > 60:
         return None
 
-    for section, aliases in SECTION_HEADERS.items():
-        for alias in aliases:
-            if (
-                norm == alias
-                or norm.startswith(f"{alias}:")
-                or norm.startswith(f"{alias} -")
-                or norm.startswith(f"{alias} |")
-                or f" {alias} " in f" {norm} "
-            ):
-                return section
+    for section, pattern in _HEADER_PATTERNS:
+        if pattern.search(norm):
+            return section
     return None
 
 
 def _split_sections(text: str) -> dict[str, list[str]]:
+    # Fresh lists per call: callers may keep or extend them.
+    return {section: list(lines) for section, lines in _split_sections_cached(text)}
+
+
+# parse_cv_text_locally and detect_sections_debug split the same cleaned text
+# within one request.
+@lru_cache(maxsize=32)
+def _split_sections_cached(text: str) -> tuple[tuple[str, tuple[str, ...]], ...]:
     sections = {"summary": [], "experience": [], "education": [], "skills": [], "other": []}
     current = "other"
 
@@ -894,27 +1282,27 @@ def _split_sections(text: str) -> dict[str, list[str]]:
 
         sections[current].append(line)
 
-    return sections
+    return tuple((section, tuple(lines)) for section, lines in sections.items())
 
 
 def _extract_dates(line: str) -> tuple[str, str]:
     normalized = _match_text(line)
-    years = re.findall(r"\b(?:19|20)\d{2}\b", line)
-    current_tokens = ("present", "current", "aujourd", "maintenant", "en cours")
-
-    if len(years) >= 2:
-        return years[0], years[1]
+    years: list[str] = []
+    month_years: list[str] = []
+    # One scan: every match carries a year, optionally preceded by a month name.
+    for match in _RE_DATE.finditer(normalized):
+        years.append(match.group("year"))
+        if len(years) >= 2:
+            return years[0], years[1]
+        if match.group("month"):
+            month_years.append(match.group())
 
     if len(years) == 1:
-        end = "Present" if any(tok in normalized for tok in current_tokens) else ""
+        end = "Present" if _RE_CURRENT.search(normalized) else ""
         return years[0], end
 
-    month_year = re.findall(
-        r"\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec|janv|fev|mars|avr|mai|juin|juil|aout|sept|oct|nov|dec)[a-z]*\s+(?:19|20)\d{2}\b",
-        normalized,
-    )
-    if len(month_year) >= 2:
-        return month_year[0], month_year[1]
+    if len(month_years) >= 2:
+        return month_years[0], month_years[1]
 
     return "", ""
 
@@ -930,11 +1318,11 @@ def _split_entry_blocks(lines: list[str]) -> list[list[str]]:
         low = _match_text(line)
         is_new = False
         if current:
-            if re.search(r"\b(?:19|20)\d{2}\b", line) and len(current) >= 2:
+            if _RE_YEAR.search(line) and len(current) >= 2:
                 is_new = True
-            elif any(h in low for h in TITLE_HINTS) and len(current) >= 3:
+            elif _RE_TITLE.search(low) and len(current) >= 3:
                 is_new = True
-            elif any(h in low for h in DEGREE_HINTS) and len(current) >= 3:
+            elif _RE_DEGREE.search(low) and len(current) >= 3:
                 is_new = True
 
         if is_new:
@@ -949,29 +1337,28 @@ def _split_entry_blocks(lines: list[str]) -> list[list[str]]:
     return blocks
 
 
-def _looks_like_experience_line(line: str) -> bool:
-    norm = _match_text(line)
-    has_year = bool(re.search(r"\b(?:19|20)\d{2}\b", line))
-    has_title = any(h in norm for h in TITLE_HINTS)
+def _looks_like_experience_line(line: str, norm: str, has_year: bool | None = None) -> bool:
+    if has_year is None:
+        has_year = bool(_RE_YEAR.search(line))
+    has_title = _RE_TITLE.search(norm) is not None
     has_sep = "|" in line or " - " in line or " @ " in line
     return has_year or (has_title and has_sep)
 
 
-def _looks_like_education_line(line: str) -> bool:
-    norm = _match_text(line)
-    has_year = bool(re.search(r"\b(?:19|20)\d{2}\b", line))
-    has_degree = any(h in norm for h in DEGREE_HINTS)
-    school_tokens = ("universite", "university", "ecole", "school", "institut", "lycee", "college")
-    has_school = any(t in norm for t in school_tokens)
+def _looks_like_education_line(line: str, norm: str, has_year: bool | None = None) -> bool:
+    if has_year is None:
+        has_year = bool(_RE_YEAR.search(line))
+    has_degree = _RE_DEGREE.search(norm) is not None
+    has_school = _RE_SCHOOL.search(norm) is not None
     return has_degree or (has_school and has_year)
 
 
-def _collect_fallback_blocks(lines: list[str], detector) -> list[list[str]]:
+def _collect_fallback_blocks(lines: list[str], norms: list[str], detector) -> list[list[str]]:
     blocks: list[list[str]] = []
     current: list[str] = []
 
-    for line in lines:
-        if detector(line):
+    for line, norm in zip(lines, norms):
+        if detector(line, norm):
             if current:
                 blocks.append(current)
             current = [line]
@@ -998,7 +1385,7 @@ def _parse_experience(lines: list[str]) -> list[dict]:
 
     for block in blocks[:6]:
         head = block[0] if block else ""
-        parts = re.split(r"\s+\|\s+|\s+-\s+|\s+@\s+", head, maxsplit=2)
+        parts = _RE_ENTRY_HEAD.split(head, maxsplit=2)
 
         title = parts[0].strip() if parts else ""
         company = parts[1].strip() if len(parts) > 1 else ""
@@ -1006,14 +1393,12 @@ def _parse_experience(lines: list[str]) -> list[dict]:
 
         start_date, end_date = _extract_dates(" ".join(block[:2]))
 
-        highlights = []
-        for line in block[1:]:
-            clean = re.sub(r"^[\-•*]\s*", "", line).strip()
-            if clean and clean not in highlights:
-                highlights.append(clean)
+        # dict.fromkeys drops repeated bullets while keeping their first position.
+        cleaned = (_strip_bullet(line) for line in block[1:])
+        highlights = list(dict.fromkeys(clean for clean in cleaned if clean))
 
         if not highlights and len(block) == 1:
-            highlights = [re.sub(r"^[\-•*]\s*", "", block[0]).strip()]
+            highlights = [_strip_bullet(block[0])]
 
         if not company and len(block) > 1:
             guess = block[1]
@@ -1044,7 +1429,7 @@ def _parse_education(lines: list[str]) -> list[dict]:
 
     for block in blocks[:6]:
         head = block[0] if block else ""
-        parts = re.split(r"\s+\|\s+|\s+-\s+", head, maxsplit=2)
+        parts = _RE_EDU_HEAD.split(head, maxsplit=2)
 
         degree = parts[0].strip() if parts else ""
         school = parts[1].strip() if len(parts) > 1 else ""
@@ -1071,63 +1456,80 @@ def _parse_education(lines: list[str]) -> list[dict]:
     return education
 
 
-def _parse_skills(lines: list[str], fallback_lines: list[str]) -> list[str]:
-    source = lines or [ln for ln in fallback_lines if "skill" in _match_text(ln) or "compet" in _match_text(ln)]
+def _parse_skills(lines: list[str], fallback_lines: list[str], fallback_norms: list[str] | None = None) -> list[str]:
+    if fallback_norms is None:
+        fallback_norms = [_match_text(ln) for ln in fallback_lines]
+    source = lines or [ln for ln, low in zip(fallback_lines, fallback_norms) if "skill" in low or "compet" in low]
     tokens: list[str] = []
 
     for line in source:
-        cleaned = re.sub(r"^[\-•*]\s*", "", line)
-        cleaned = re.sub(r"^(skills|competences|competence|technologies|outils)\s*[:\-]\s*", "", _match_text(cleaned), flags=re.IGNORECASE)
-        for part in re.split(r"[,;/|]", cleaned):
+        cleaned = _RE_SKILLS_PREFIX.sub("", _match_text(_strip_bullet(line)))
+        for part in _RE_SKILLS_SPLIT.split(cleaned):
             skill = part.strip()
             if not skill:
                 continue
             if len(skill) > 35:
                 continue
-            if re.fullmatch(r"(?:19|20)\d{2}", skill):
+            if _RE_YEAR_ONLY.fullmatch(skill):
                 continue
             tokens.append(skill)
 
     # Additional fallback: infer technical keywords even without explicit section header.
     if not tokens:
-        for line in fallback_lines:
-            low = _match_text(line)
+        for line, low in zip(fallback_lines, fallback_norms):
             if _looks_like_name_line(line) or "@" in line:
                 continue
             if "|" in line or "," in line or ";" in line:
-                for part in re.split(r"[,;/|]", low):
+                for part in _RE_SKILLS_SPLIT.split(low):
                     skill = part.strip()
                     if skill in SKILL_HINT_TOKENS:
                         tokens.append(skill)
             else:
-                words = [w.strip() for w in re.split(r"\s+", low) if w.strip()]
+                words = [w.strip() for w in _RE_WS.split(low) if w.strip()]
                 for w in words:
                     if w in SKILL_HINT_TOKENS:
                         tokens.append(w)
 
-    unique: list[str] = []
-    seen = set()
+    # Case-insensitive dedupe; the first spelling of each skill is kept.
+    unique: dict[str, str] = {}
     for token in tokens:
-        norm = token.lower()
-        if norm not in seen:
-            seen.add(norm)
-            unique.append(token)
+        unique.setdefault(token.lower(), token)
 
-    return unique[:30]
+    return list(unique.values())[:30]
+
+
+def _scan_anchors(lines: list[str]) -> dict:
+    # One pass over the lines: first email / phone / LinkedIn URL, and the set of
+    # lines carrying a year. Phone-like matches that contain a year are date ranges
+    # ("2012 - 2020", "01 2018 - 12 2020"), not phone numbers.
+    found = {"email": "", "phone": "", "linkedin": ""}
+    year_lines: set[str] = set()
+    for line in lines:
+        if _RE_YEAR.search(line):
+            year_lines.add(line)
+        for m in _RE_ANCHORS.finditer(line):
+            kind = m.lastgroup
+            if found[kind] or (kind == "phone" and _RE_YEAR.search(m.group())):
+                continue
+            found[kind] = m.group()
+    found["year_lines"] = year_lines
+    return found
 
 
-def parse_cv_text_locally(text: str) -> dict:
-    cleaned_text = clean_extracted_text(text)
+def parse_cv_text_locally(text: str, *, already_cleaned: bool = False) -> dict:
+    cleaned_text = text if already_cleaned else clean_extracted_text(text)
     cv = default_cv()
 
     if not cleaned_text:
         return cv
 
-    email_match = re.search(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}", cleaned_text)
-    phone_match = re.search(r"(?:\+?\d[\d\s().-]{7,}\d)", cleaned_text)
-    linkedin_match = re.search(r"(?:https?://)?(?:www\.)?linkedin\.com/[^\s]+", cleaned_text, flags=re.IGNORECASE)
-
     all_lines = [ln.strip() for ln in cleaned_text.splitlines() if ln.strip()]
+    # Normalized once per line and shared by every predicate below; section lines
+    # are the same stripped strings, so they are looked up by text.
+    norm_lines = [_match_text(ln) for ln in all_lines]
+    norm_of = dict(zip(all_lines, norm_lines))
+    anchors = _scan_anchors(all_lines)
+    year_lines = anchors["year_lines"]
     sections = _split_sections(cleaned_text)
 
     if all_lines:
@@ -1136,10 +1538,10 @@ def parse_cv_text_locally(text: str) -> dict:
             cv["personal_info"]["first_name"] = first_line_parts[0]
             cv["personal_info"]["last_name"] = " ".join(first_line_parts[1:])
 
-    cv["personal_info"]["email"] = email_match.group(0) if email_match else ""
-    cv["personal_info"]["phone"] = phone_match.group(0) if phone_match else ""
-    cv["personal_info"]["linkedin"] = linkedin_match.group(0) if linkedin_match else ""
-    cv["personal_info"]["location"] = _extract_city_from_lines(all_lines)
+    cv["personal_info"]["email"] = anchors["email"]
+    cv["personal_info"]["phone"] = anchors["phone"]
+    cv["personal_info"]["linkedin"] = anchors["linkedin"]
+    cv["personal_info"]["location"] = _extract_city_from_lines(all_lines, norm_lines)
 
     if not cv["personal_info"]["linkedin"]:
         cv["personal_info"]["linkedin"] = _extract_linkedin_fallback(cleaned_text)
@@ -1147,7 +1549,7 @@ def parse_cv_text_locally(text: str) -> dict:
     # If name is missing but email exists, infer a basic first/last name from local part.
     if (not cv["personal_info"]["first_name"] or not cv["personal_info"]["last_name"]) and cv["personal_info"]["email"]:
         local = cv["personal_info"]["email"].split("@", 1)[0]
-        local = re.sub(r"[^A-Za-z]+", " ", local).strip()
+        local = _RE_NON_ALPHA.sub(" ", local).strip()
         parts = [p for p in local.split() if p]
         if len(parts) >= 2:
             cv["personal_info"]["first_name"] = cv["personal_info"]["first_name"] or parts[0].capitalize()
@@ -1158,18 +1560,18 @@ def parse_cv_text_locally(text: str) -> dict:
         filtered_summary = [
             ln
             for ln in summary_lines
-            if _is_good_summary_line(ln) and not _looks_like_name_line(ln) and "linkedin" not in _match_text(ln)
+            if _is_good_summary_line(ln, norm_of[ln]) and not _looks_like_name_line(ln) and "linkedin" not in norm_of[ln]
         ]
         cv["summary"] = " ".join(filtered_summary[:4])
     else:
         fallback_summary = [
             ln
             for ln in sections["other"][:12]
-            if _is_good_summary_line(ln)
+            if _is_good_summary_line(ln, norm_of[ln])
             and not _looks_like_name_line(ln)
-            and "linkedin" not in _match_text(ln)
-            and "compet" not in _match_text(ln)
-            and "skill" not in _match_text(ln)
+            and "linkedin" not in norm_of[ln]
+            and "compet" not in norm_of[ln]
+            and "skill" not in norm_of[ln]
         ]
         cv["summary"] = " ".join(fallback_summary[:2])
 
@@ -1177,7 +1579,7 @@ def parse_cv_text_locally(text: str) -> dict:
     if cv["summary"] and _is_noise_line(cv["summary"]):
         cv["summary"] = ""
 
-    cv["skills"] = _parse_skills(sections["skills"], all_lines)
+    cv["skills"] = _parse_skills(sections["skills"], all_lines, norm_lines)
 
     experience_lines = sections["experience"]
     education_lines = sections["education"]
@@ -1187,12 +1589,16 @@ def parse_cv_text_locally(text: str) -> dict:
 
     # Fallback from full text if headers are missing or OCR/layout broke sections.
     if not cv["experience"]:
-        exp_blocks = _collect_fallback_blocks(all_lines, _looks_like_experience_line)
+        exp_blocks = _collect_fallback_blocks(
+            all_lines, norm_lines, lambda ln, norm: _looks_like_experience_line(ln, norm, ln in year_lines)
+        )
         flattened_exp = [ln for block in exp_blocks for ln in block]
         cv["experience"] = _parse_experience(flattened_exp)
 
     if not cv["education"]:
-        edu_blocks = _collect_fallback_blocks(all_lines, _looks_like_education_line)
+        edu_blocks = _collect_fallback_blocks(
+            all_lines, norm_lines, lambda ln, norm: _looks_like_education_line(ln, norm, ln in year_lines)
+        )
         flattened_edu = [ln for block in edu_blocks for ln in block]
         cv["education"] = _parse_education(flattened_edu)
 
@@ -1223,8 +1629,8 @@ def parse_cv_text_locally(text: str) -> dict:
 
     # Final fallback to satisfy minimum objective on regular CVs.
     if not cv["experience"]:
-        year_lines = [ln for ln in all_lines if re.search(r"\b(?:19|20)\d{2}\b", ln)]
-        if year_lines:
+        dated_lines = [ln for ln in all_lines if ln in year_lines]
+        if dated_lines:
             cv["experience"] = [
                 {
                     "company": "",
@@ -1232,12 +1638,14 @@ def parse_cv_text_locally(text: str) -> dict:
                     "start_date": "",
                     "end_date": "",
                     "location": "",
-                    "highlights": year_lines[:4],
+                    "highlights": dated_lines[:4],
                 }
             ]
 
     if not cv["education"]:
-        edu_hint_lines = [ln for ln in all_lines if _looks_like_education_line(ln)]
+        edu_hint_lines = [
+            ln for ln, norm in zip(all_lines, norm_lines) if _looks_like_education_line(ln, norm, ln in year_lines)
+        ]
         if edu_hint_lines:
             cv["education"] = [
                 {
@@ -1253,28 +1661,66 @@ def parse_cv_text_locally(text: str) -> dict:
     return cv
 
 
-def parse_cv_text_with_ai(text: str, language_hint: str | None = None) -> dict:
-    cleaned_text = clean_extracted_text(text)
-    local_legacy = parse_cv_text_locally(cleaned_text)
-    local = to_strict_schema(local_legacy)
-    # Priority: Google AI (if configured), then OpenAI, then local parser.
-    parsed_google = _llm_parse_with_google(cleaned_text, language_hint)
-    if parsed_google:
-        strict_google = normalize_structured_cv(parsed_google, local_legacy)
-        if validate_strict_schema(strict_google):
-            return strict_google
+def _is_usable_llm_parse(parsed) -> bool:
+    # Only a dict with at least one non-empty prompted section counts as an LLM parse;
+    # anything else (a JSON list, {}, unrelated keys) is treated as a failed call.
+    return isinstance(parsed, dict) and any(parsed.get(key) for key in _LLM_SECTION_KEYS)
 
-    parsed_openai = _llm_parse_with_openai(cleaned_text, language_hint)
-    if parsed_openai:
-        strict_openai = normalize_structured_cv(parsed_openai, local_legacy)
-        if validate_strict_schema(strict_openai):
-            return strict_openai
 
-    return local
+def _race_llm_parses(cleaned_text: str, language_hint: str | None) -> dict | None:
+    # First usable answer wins; the other call is left to finish in the background.
+    executor = ThreadPoolExecutor(max_workers=2)
+    pending = {
+        executor.submit(_llm_parse_with_google, cleaned_text, language_hint),
+        executor.submit(_llm_parse_with_openai, cleaned_text, language_hint),
+    }
+    try:
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                parsed = future.result()
+                if _is_usable_llm_parse(parsed):
+                    return parsed
+        return None
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def parse_cv_text_with_ai(
+    text: str, language_hint: str | None = None, preparsed: dict | None = None, *, already_cleaned: bool = False
+) -> dict:
+    return parse_cv_text_with_origin(text, language_hint, preparsed, already_cleaned=already_cleaned)[0]
+
+
+def parse_cv_text_with_origin(
+    text: str, language_hint: str | None = None, preparsed: dict | None = None, *, already_cleaned: bool = False
+) -> tuple[dict, str]:
+    # Returns (cv, origin), origin being "llm" or "local" (no provider configured, or
+    # every LLM call failed). preparsed: structured CV already returned by the
+    # extraction step (fused image OCR). already_cleaned: text comes from
+    # detect_source_and_extract, whose extractors return cleaned text.
+    cleaned_text = text if already_cleaned else clean_extracted_text(text)
+    # The local regex parse only runs if the LLM reply leaves a field empty (or no LLM answers).
+    local_factory = partial(parse_cv_text_locally, cleaned_text, already_cleaned=True)
+    # normalize_structured_cv ends in to_strict_schema, whose output always has the
+    # strict shape, so results are not re-validated here (the view validates once).
+    if _is_usable_llm_parse(preparsed):
+        return normalize_structured_cv(preparsed, local_factory=local_factory), "llm"
+
+    if RACE_LLMS:
+        parsed = _race_llm_parses(cleaned_text, language_hint)
+    else:
+        # Priority: Google AI (if configured), then OpenAI, then local parser.
+        parsed = _llm_parse_with_google(cleaned_text, language_hint)
+        if not _is_usable_llm_parse(parsed):
+            parsed = _llm_parse_with_openai(cleaned_text, language_hint)
+    if _is_usable_llm_parse(parsed):
+        return normalize_structured_cv(parsed, local_factory=local_factory), "llm"
+    return to_strict_schema(local_factory()), "local"
 
 
-def detect_sections_debug(text: str) -> dict:
-    cleaned = clean_extracted_text(text)
+def detect_sections_debug(text: str, *, already_cleaned: bool = False) -> dict:
+    cleaned = text if already_cleaned else clean_extracted_text(text)
     sections = _split_sections(cleaned)
     return {
         "summary": sections.get("summary", []),
@@ -1284,61 +1730,62 @@ def detect_sections_debug(text: str) -> dict:
     }
 
 
-def detect_source_and_extract(file_name: str, content_type: str, data: bytes) -> tuple[str, str]:
+def _extract_with_speculative_ai(data: bytes | BinaryIO, mime_type: str, local_fn) -> str:
+    # Extractors and Document AI both return cleaned text.
+    future = None
+    executor = None
+    if SPECULATIVE_DOCUMENT_AI and _google_api_key():
+        executor = ThreadPoolExecutor(max_workers=1)
+        future = executor.submit(_extract_text_with_google_document_ai, _as_bytes(data), mime_type)
+
+    try:
+        raw = local_fn(data)
+        if not _is_low_quality_extraction(raw, already_cleaned=True):
+            return raw
+        ai_raw = future.result() if future else _extract_text_with_google_document_ai(_as_bytes(data), mime_type)
+        if ai_raw and not _is_low_quality_extraction(ai_raw, already_cleaned=True):
+            return ai_raw
+        # Avoid returning binary garbage as CV text.
+        return ""
+    finally:
+        if executor:
+            # An upload already sent to Document AI finishes in the background.
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def detect_source_and_extract(
+    file_name: str, content_type: str, data: bytes | BinaryIO, language_hint: str | None = None
+) -> tuple[str, str, dict | None]:
+    # (source, text, preparsed): preparsed is a structured CV when extraction already
+    # produced one (image OCR fused with parsing), to hand to parse_cv_text_with_ai.
     lower_name = (file_name or "").lower()
     mime = (content_type or "").lower()
 
     if mime == "application/pdf" or lower_name.endswith(".pdf"):
-        raw = extract_text_from_pdf(data)
-        if _is_low_quality_extraction(raw):
-            ai_raw = _extract_text_with_google_document_ai(data, "application/pdf")
-            if ai_raw:
-                raw = ai_raw
-        if _is_low_quality_extraction(raw):
-            # Avoid returning binary garbage as CV text.
-            raw = ""
-        return "pdf", raw
+        return "pdf", _extract_with_speculative_ai(data, "application/pdf", extract_text_from_pdf), None
 
     if (
         mime == "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
         or mime == "application/vnd.ms-word.document.macroenabled.12"
         or lower_name.endswith(".docx")
     ):
-        raw = extract_text_from_docx(data)
-        if _is_low_quality_extraction(raw):
-            ai_raw = _extract_text_with_google_document_ai(
-                data, "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-            )
-            if ai_raw:
-                raw = ai_raw
-        if _is_low_quality_extraction(raw):
-            raw = ""
-        return "docx", raw
+        return "docx", _extract_with_speculative_ai(
+            data, "application/vnd.openxmlformats-officedocument.wordprocessingml.document", extract_text_from_docx
+        ), None
 
     if mime == "application/msword" or lower_name.endswith(".doc"):
-        raw = extract_text_from_doc(data)
-        if _is_low_quality_extraction(raw):
-            ai_raw = _extract_text_with_google_document_ai(data, "application/msword")
-            if ai_raw:
-                raw = ai_raw
-        if _is_low_quality_extraction(raw):
-            raw = ""
-        return "doc", raw
+        return "doc", _extract_with_speculative_ai(
+            data, "application/msword", lambda file_data: extract_text_from_doc(_as_bytes(file_data))
+        ), None
 
     if mime in {"application/octet-stream", "application/zip"} and lower_name.endswith(".docx"):
-        raw = extract_text_from_docx(data)
-        if _is_low_quality_extraction(raw):
-            ai_raw = _extract_text_with_google_document_ai(
-                data, "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-            )
-            if ai_raw:
-                raw = ai_raw
-        if _is_low_quality_extraction(raw):
-            raw = ""
-        return "docx", raw
+        return "docx", _extract_with_speculative_ai(
+            data, "application/vnd.openxmlformats-officedocument.wordprocessingml.document", extract_text_from_docx
+        ), None
 
     if mime.startswith("image/") or lower_name.endswith((".png", ".jpg", ".jpeg")):
         image_mime = mime if mime.startswith("image/") else "image/jpeg"
-        return "image", extract_text_from_image_with_ai(data, image_mime)
+        text, preparsed = extract_text_from_image_with_ai(_as_bytes(data), image_mime, language_hint)
+        return "image", text, preparsed
 
     raise ValueError("Unsupported format. Use PDF, DOCX, DOC, JPG or PNG.")
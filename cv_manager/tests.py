@@ -0,0 +1,181 @@
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase
+
+from . import services, views
+
+CV_TEXT = "Jean Dupont\njean@example.com\nExperience\nDeveloppeur | Acme | Paris 2019 - 2021"
+
+COMPLETE_REPLY = {
+    "personal": {
+        "firstName": "Jean",
+        "lastName": "Dupont",
+        "email": "jean@example.com",
+        "phone": "+33 6 12 34 56 78",
+        "city": "Paris",
+        "linkedin": "linkedin.com/in/jeandupont",
+    },
+    "summary": "Developpeur Python.",
+    "skills": ["Python", "Django"],
+    "experience": [
+        {
+            "title": "Developpeur",
+            "company": "Acme",
+            "location": "Paris",
+            "startDate": "2019",
+            "endDate": "2021",
+            "bullets": ["APIs Django"],
+        }
+    ],
+    "education": [
+        {
+            "degree": "Master",
+            "school": "Universite",
+            "location": "Lyon",
+            "startDate": "2014",
+            "endDate": "2016",
+            "details": "Mention bien",
+        }
+    ],
+}
+
+
+class ParseCvTextWithAiTests(SimpleTestCase):
+    def test_complete_llm_reply_skips_local_parse(self):
+        with (
+            mock.patch.object(services, "_llm_parse_with_google", return_value=COMPLETE_REPLY),
+            mock.patch.object(services, "parse_cv_text_locally", wraps=services.parse_cv_text_locally) as local,
+        ):
+            cv = services.parse_cv_text_with_ai(CV_TEXT)
+
+        local.assert_not_called()
+        self.assertEqual(cv["personal"]["phone"], "+33 6 12 34 56 78")
+        self.assertEqual(cv["personal"]["city"], "Paris")
+        self.assertEqual(cv["experience"][0]["startDate"], "2019")
+        self.assertEqual(cv["experience"][0]["bullets"], ["APIs Django"])
+        self.assertEqual(cv["education"][0]["location"], "Lyon")
+
+    def test_missing_llm_fields_fall_back_to_local_parse(self):
+        reply = {**COMPLETE_REPLY, "personal": {**COMPLETE_REPLY["personal"], "email": ""}}
+        with mock.patch.object(services, "_llm_parse_with_google", return_value=reply):
+            cv = services.parse_cv_text_with_ai(CV_TEXT)
+
+        self.assertEqual(cv["personal"]["email"], "jean@example.com")
+
+    def test_local_parse_runs_once_for_several_missing_fields(self):
+        reply = {**COMPLETE_REPLY, "personal": {**COMPLETE_REPLY["personal"], "email": ""}, "skills": []}
+        with (
+            mock.patch.object(services, "_llm_parse_with_google", return_value=reply),
+            mock.patch.object(services, "parse_cv_text_locally", wraps=services.parse_cv_text_locally) as local,
+        ):
+            cv = services.parse_cv_text_with_ai(CV_TEXT)
+
+        local.assert_called_once()
+        self.assertEqual(cv["personal"]["email"], "jean@example.com")
+
+
+class ScanAnchorsTests(SimpleTestCase):
+    def test_dotted_month_year_range_is_a_year_line(self):
+        anchors = services._scan_anchors(["Developpeur Python chez Acme", "09.2019 - 06.2021"])
+        self.assertEqual(anchors["year_lines"], {"09.2019 - 06.2021"})
+        self.assertEqual(anchors["phone"], "")
+
+    def test_space_separated_month_year_range_is_a_year_line(self):
+        anchors = services._scan_anchors(["01 2018 - 12 2020"])
+        self.assertEqual(anchors["year_lines"], {"01 2018 - 12 2020"})
+        self.assertEqual(anchors["phone"], "")
+
+    def test_year_range_is_not_a_phone(self):
+        anchors = services._scan_anchors(["Lycee Hugo 2012 - 2020", "+33 6 12 34 56 78"])
+        self.assertEqual(anchors["phone"], "+33 6 12 34 56 78")
+        self.assertEqual(anchors["year_lines"], {"Lycee Hugo 2012 - 2020"})
+
+    def test_month_year_dates_yield_experience(self):
+        cv = services.parse_cv_text_locally(
+            "Jean Dupont\njean@x.com\nD\u00e9veloppeur Python chez Acme\n09.2019 - 06.2021\nAPIs Django\n"
+        )
+        self.assertEqual(len(cv["experience"]), 1)
+        self.assertEqual((cv["experience"][0]["start_date"], cv["experience"][0]["end_date"]), ("2019", "2021"))
+
+        cv = services.parse_cv_text_locally("Jean Dupont\njean@x.com\nStage Acme 06 2019 - 09 2019\n")
+        self.assertIn("Stage Acme", cv["experience"][0]["title"])
+
+
+class StripPageFurnitureTests(SimpleTestCase):
+    def test_header_and_footer_repeated_on_two_pages(self):
+        pages = ["Jean Dupont\nExperience A\nCV - confidentiel", "Jean Dupont\nExperience B\nCV - confidentiel"]
+        self.assertEqual(
+            services._strip_page_furniture(pages),
+            ["Jean Dupont\nExperience A\nCV - confidentiel", "Experience B"],
+        )
+
+    def test_header_repeated_on_two_of_three_pages(self):
+        pages = ["Jean Dupont\nA\n1", "Jean Dupont\nB\n2", "Formation\nC\n3"]
+        self.assertEqual(services._strip_page_furniture(pages), ["Jean Dupont\nA\n1", "B\n2", "Formation\nC\n3"])
+
+    def test_first_occurrence_is_kept(self):
+        pages = ["Jean Dupont\nA\nB", "Jean Dupont\nC\nD", "Jean Dupont\nE\nF"]
+        cleaned = services._strip_page_furniture(pages)
+        self.assertEqual(cleaned[0], "Jean Dupont\nA\nB")
+        self.assertEqual("\n".join(cleaned).count("Jean Dupont"), 1)
+
+    def test_short_pages_narrow_the_edges(self):
+        # Two-line pages only have one line per edge, so the body line is never furniture.
+        self.assertEqual(services._strip_page_furniture(["Paris\nA", "Paris\nB"]), ["Paris\nA", "B"])
+        self.assertEqual(services._strip_page_furniture(["Paris", "Paris"]), ["Paris", "Paris"])
+
+    def test_repeated_line_away_from_edges_is_kept(self):
+        pages = ["h1\nh2\nParis\nf1\nf2", "h3\nh4\nParis\nf3\nf4"]
+        self.assertEqual(services._strip_page_furniture(pages), pages)
+
+    def test_inner_line_needs_furniture_outer_line(self):
+        # "Paris" sits second on both pages, but the first lines differ: it is content.
+        pages = ["q\nParis\nA\nw", "r\nParis\nB\ne"]
+        self.assertEqual(services._strip_page_furniture(pages), pages)
+
+    def test_repeated_outer_line_keeps_distinct_inner_line(self):
+        pages = ["Jean Dupont\nDeveloppeur\nA\nB", "Jean Dupont\nStage Acme 2019\nC\nD"]
+        self.assertEqual(
+            services._strip_page_furniture(pages),
+            ["Jean Dupont\nDeveloppeur\nA\nB", "Stage Acme 2019\nC\nD"],
+        )
+
+
+class ParseCvCacheTests(SimpleTestCase):
+    def setUp(self):
+        views._PARSE_CACHE.clear()
+
+    def _post(self):
+        upload = SimpleUploadedFile("cv.doc", CV_TEXT.encode("cp1252"), content_type="application/msword")
+        return self.client.post("/api/parse-cv", {"file": upload})
+
+    def test_local_fallback_is_not_cached(self):
+        # Both providers failing leaves the local parse, which must not be cached.
+        with (
+            mock.patch.object(services, "_llm_parse_with_google", return_value={}),
+            mock.patch.object(services, "_llm_parse_with_openai", return_value={}),
+        ):
+            self.assertEqual(self._post().status_code, 200)
+        self.assertEqual(len(views._PARSE_CACHE), 0)
+
+        with mock.patch.object(services, "_llm_parse_with_google", return_value=COMPLETE_REPLY):
+            self.assertEqual(self._post().status_code, 200)
+        self.assertEqual(len(views._PARSE_CACHE), 1)
+
+        with mock.patch.object(views, "detect_source_and_extract") as extract:
+            response = self._post()
+        extract.assert_not_called()
+        self.assertEqual(response.json()["cv"]["personal"]["city"], "Paris")
+
+    def test_unusable_llm_reply_is_not_cached(self):
+        # A JSON list, or a dict without any prompted section, is a failed LLM call.
+        for reply in ([COMPLETE_REPLY], {"name": "Jean Dupont", "skills": []}):
+            with (
+                self.subTest(reply=reply),
+                mock.patch.object(services, "_llm_parse_with_google", return_value=reply),
+                mock.patch.object(services, "_llm_parse_with_openai", return_value={}),
+            ):
+                self.assertEqual(self._post().status_code, 200)
+                self.assertEqual(len(views._PARSE_CACHE), 0)
+                self.assertEqual(services.parse_cv_text_with_origin(CV_TEXT)[1], "local")
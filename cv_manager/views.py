@@ -1,13 +1,69 @@
-﻿import json
+﻿import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
 
+from django.conf import settings
 from django.http import HttpRequest, HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404, render
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_GET, require_POST
 
 from .models import Resume
-from .pdf_export import build_cv_pdf
-from .services import detect_sections_debug, detect_source_and_extract, parse_cv_text_with_ai, validate_strict_schema
+from .pdf_export import PDF_BACKEND, build_cv_pdf, build_cv_pdf_html
+from .services import detect_sections_debug, detect_source_and_extract, parse_cv_text_with_origin, validate_strict_schema
+
+try:
+    # Optional: faster encoding of large CV payloads, same JSON output.
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# LLM parses keyed by upload content, so re-submitting the same file skips extraction
+# and the LLM calls. Local fallback results are not cached: a retry after a failed
+# LLM call must reach the LLM again. Per process; 0 disables.
+PARSE_CACHE_SIZE = int(os.getenv("CV_PARSE_CACHE_SIZE", "256"))
+# Larger uploads are not hashed or cached.
+PARSE_CACHE_MAX_BYTES = int(os.getenv("CV_PARSE_CACHE_MAX_BYTES", str(10 * 1024 * 1024)))
+_PARSE_CACHE: OrderedDict[bytes, tuple[str, str, dict]] = OrderedDict()
+# Requests share the cache across threads (threaded gunicorn workers, runserver).
+_PARSE_CACHE_LOCK = threading.Lock()
+
+
+def _parse_cache_key(upload, language_hint: str | None) -> bytes | None:
+    if not PARSE_CACHE_SIZE or upload.size > PARSE_CACHE_MAX_BYTES:
+        return None
+    # Name and content type pick the extractor; the language hint reaches the LLM prompt.
+    digest = hashlib.sha256(f"{upload.name}\0{upload.content_type}\0{language_hint}\0".encode())
+    for chunk in upload.chunks():
+        digest.update(chunk)
+    return digest.digest()
+
+
+class OrjsonResponse(JsonResponse):
+    def __init__(self, data, safe: bool = True, **kwargs):
+        if orjson is None:
+            super().__init__(data, safe=safe, **kwargs)
+            return
+        if safe and not isinstance(data, dict):
+            raise TypeError("In order to allow non-dict objects to be serialized set the safe parameter to False.")
+        try:
+            content = orjson.dumps(data)
+        except TypeError:
+            # Values orjson rejects (e.g. integers above 64 bits) go through Django's encoder.
+            super().__init__(data, safe=safe, **kwargs)
+            return
+        kwargs.setdefault("content_type", "application/json")
+        HttpResponse.__init__(self, content=content, **kwargs)
+
+
+def _json_body(request: HttpRequest):
+    # Both parsers accept the raw bytes; orjson.JSONDecodeError subclasses json.JSONDecodeError.
+    if orjson is not None:
+        return orjson.loads(request.body)
+    return json.loads(request.body)
 
 
 def index(request: HttpRequest):
@@ -20,26 +76,40 @@ def templates_page(request: HttpRequest):
 
 @csrf_exempt
 @require_POST
-def parse_cv(request: HttpRequest) -> JsonResponse:
+def parse_cv(request: HttpRequest) -> OrjsonResponse:
     upload = request.FILES.get("file")
     language_hint = request.POST.get("language_hint") or None
 
     if not upload:
-        return JsonResponse({"detail": "file is required"}, status=400)
+        return OrjsonResponse({"detail": "file is required"}, status=400)
+
+    if not upload.size:
+        return OrjsonResponse({"detail": "Empty file"}, status=400)
 
-    data = upload.read()
-    if not data:
-        return JsonResponse({"detail": "Empty file"}, status=400)
+    cache_key = _parse_cache_key(upload, language_hint)
+    cached = None
+    if cache_key:
+        with _PARSE_CACHE_LOCK:
+            cached = _PARSE_CACHE.get(cache_key)
+            if cached:
+                _PARSE_CACHE.move_to_end(cache_key)
+    if cached:
+        source, raw_text, cv_json = cached
+        return _parse_cv_response(request, source, language_hint, raw_text, cv_json)
 
+    # Extractors read the upload as a stream; Django keeps large uploads on disk. The
+    # text they return is already cleaned, so later steps skip clean_extracted_text.
     try:
-        source, raw_text = detect_source_and_extract(upload.name, upload.content_type or "", data)
+        source, raw_text, preparsed = detect_source_and_extract(
+            upload.name, upload.content_type or "", upload, language_hint
+        )
     except ValueError as exc:
-        return JsonResponse({"detail": str(exc)}, status=400)
+        return OrjsonResponse({"detail": str(exc)}, status=400)
     except Exception as exc:
-        return JsonResponse({"detail": f"Unexpected extraction error: {exc}"}, status=500)
+        return OrjsonResponse({"detail": f"Unexpected extraction error: {exc}"}, status=500)
 
     if not raw_text.strip():
-        return JsonResponse(
+        return OrjsonResponse(
             {
                 "detail": (
                     "No readable text extracted from this file. "
@@ -51,40 +121,51 @@ def parse_cv(request: HttpRequest) -> JsonResponse:
         )
 
     try:
-        cv_json = parse_cv_text_with_ai(raw_text, language_hint)
+        cv_json, origin = parse_cv_text_with_origin(raw_text, language_hint, preparsed, already_cleaned=True)
     except Exception as exc:
-        return JsonResponse({"detail": f"Unexpected parsing error: {exc}"}, status=500)
-    debug_sections = detect_sections_debug(raw_text)
+        return OrjsonResponse({"detail": f"Unexpected parsing error: {exc}"}, status=500)
 
     if not validate_strict_schema(cv_json):
-        return JsonResponse(
+        return OrjsonResponse(
             {
                 "detail": "Parsing failed: output does not match strict schema.",
                 "debug_raw_text": raw_text,
-                "debug_sections": debug_sections,
+                "debug_sections": detect_sections_debug(raw_text, already_cleaned=True),
             },
             status=422,
         )
 
-    return JsonResponse(
-        {
-            "source": source,
-            "language": language_hint,
-            "raw_text": raw_text,
-            "cv": cv_json,
-            "debug_raw_text": raw_text,
-            "debug_sections": debug_sections,
-        }
-    )
+    if cache_key and origin == "llm":
+        with _PARSE_CACHE_LOCK:
+            _PARSE_CACHE[cache_key] = (source, raw_text, cv_json)
+            while len(_PARSE_CACHE) > PARSE_CACHE_SIZE:
+                _PARSE_CACHE.popitem(last=False)
+    return _parse_cv_response(request, source, language_hint, raw_text, cv_json)
+
+
+def _parse_cv_response(
+    request: HttpRequest, source: str, language_hint: str | None, raw_text: str, cv_json: dict
+) -> OrjsonResponse:
+    payload = {
+        "source": source,
+        "language": language_hint,
+        "raw_text": raw_text,
+        "cv": cv_json,
+    }
+    # raw_text is kept: the front end saves it with the CV and shows it when debug fields are absent.
+    if settings.DEBUG or request.GET.get("debug"):
+        payload["debug_raw_text"] = raw_text
+        payload["debug_sections"] = detect_sections_debug(raw_text, already_cleaned=True)
+    return OrjsonResponse(payload)
 
 
 @csrf_exempt
 @require_POST
-def save_cv(request: HttpRequest) -> JsonResponse:
+def save_cv(request: HttpRequest) -> OrjsonResponse:
     try:
-        payload = json.loads(request.body.decode("utf-8"))
+        payload = _json_body(request)
     except json.JSONDecodeError:
-        return JsonResponse({"detail": "Invalid JSON"}, status=400)
+        return OrjsonResponse({"detail": "Invalid JSON"}, status=400)
 
     title = str(payload.get("title") or "Mon CV")
     source = str(payload.get("source") or "text")
@@ -100,7 +181,7 @@ def save_cv(request: HttpRequest) -> JsonResponse:
         cv_json=cv,
     )
 
-    return JsonResponse(
+    return OrjsonResponse(
         {
             "id": doc.id,
             "title": doc.title,
@@ -116,52 +197,56 @@ def save_cv(request: HttpRequest) -> JsonResponse:
 @require_POST
 def export_cv_pdf(request: HttpRequest) -> HttpResponse:
     try:
-        payload = json.loads(request.body.decode("utf-8"))
+        payload = _json_body(request)
     except json.JSONDecodeError:
-        return JsonResponse({"detail": "Invalid JSON"}, status=400)
+        return OrjsonResponse({"detail": "Invalid JSON"}, status=400)
 
     cv = payload.get("cv")
     template = str(payload.get("template") or "simple")
     title = str(payload.get("title") or "cv")
 
     if not isinstance(cv, dict):
-        return JsonResponse({"detail": "cv object is required"}, status=400)
+        return OrjsonResponse({"detail": "cv object is required"}, status=400)
 
-    try:
-        pdf_bytes = build_cv_pdf(cv, template, title)
-    except Exception as exc:
-        return JsonResponse({"detail": f"PDF export failed: {exc}"}, status=500)
     filename = f"{title.replace(' ', '_')}_{template}.pdf"
-    return HttpResponse(
-        pdf_bytes,
+    response = HttpResponse(
         content_type="application/pdf",
         headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
+    try:
+        if PDF_BACKEND == "html":
+            build_cv_pdf_html(cv, template, title, out=response)
+        else:
+            build_cv_pdf(cv, template, title, out=response, cache_dir=settings.CV_PDF_CACHE_DIR)
+    except Exception as exc:
+        return OrjsonResponse({"detail": f"PDF export failed: {exc}"}, status=500)
+    return response
 
 
 @require_GET
-def cv_list(request: HttpRequest) -> JsonResponse:
-    docs = Resume.objects.all()
-    return JsonResponse(
+def cv_list(request: HttpRequest) -> OrjsonResponse:
+    # Only list columns are selected: raw_text and cv_json can be large.
+    docs = Resume.objects.values("id", "title", "source", "language", "created_at", "updated_at")
+    return OrjsonResponse(
         [
             {
-                "id": d.id,
-                "title": d.title,
-                "source": d.source,
-                "language": d.language,
-                "created_at": d.created_at.isoformat(),
-                "updated_at": d.updated_at.isoformat(),
+                "id": d["id"],
+                "title": d["title"],
+                "source": d["source"],
+                "language": d["language"],
+                "created_at": d["created_at"].isoformat(),
+                "updated_at": d["updated_at"].isoformat(),
             }
-            for d in docs
+            for d in docs.iterator(chunk_size=200)
         ],
         safe=False,
     )
 
 
 @require_GET
-def cv_detail(request: HttpRequest, cv_id: int) -> JsonResponse:
+def cv_detail(request: HttpRequest, cv_id: int) -> OrjsonResponse:
     doc = get_object_or_404(Resume, id=cv_id)
-    return JsonResponse(
+    return OrjsonResponse(
         {
             "id": doc.id,
             "title": doc.title,
@@ -10,6 +10,9 @@ ALLOWED_HOSTS = [host.strip() for host in os.getenv("ALLOWED_HOSTS", "").split("
 RENDER_EXTERNAL_HOSTNAME = os.getenv("RENDER_EXTERNAL_HOSTNAME")
 VERCEL_URL = os.getenv("VERCEL_URL")
 IS_VERCEL = os.getenv("VERCEL") == "1" or bool(VERCEL_URL)
+DATABASE_URL = os.getenv("DATABASE_URL", "")
+# find_spec walks sys.path, so optional packages are looked up once per cold start.
+HAS_WHITENOISE = importlib.util.find_spec("whitenoise") is not None
 if RENDER_EXTERNAL_HOSTNAME:
     ALLOWED_HOSTS.append(RENDER_EXTERNAL_HOSTNAME)
 if VERCEL_URL:
@@ -45,7 +48,7 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
-if importlib.util.find_spec("whitenoise"):
+if HAS_WHITENOISE:
     MIDDLEWARE.insert(1, "whitenoise.middleware.WhiteNoiseMiddleware")
 
 ROOT_URLCONF = "cv_project.urls"
@@ -68,21 +71,26 @@ TEMPLATES = [
 WSGI_APPLICATION = "cv_project.wsgi.application"
 ASGI_APPLICATION = "cv_project.asgi.application"
 
-if importlib.util.find_spec("dj_database_url"):
+if DATABASE_URL and importlib.util.find_spec("dj_database_url"):
     import dj_database_url  # type: ignore
 
     DATABASES = {
-        "default": dj_database_url.config(
-            default=f"sqlite:///{BASE_DIR / 'db.sqlite3'}",
+        "default": dj_database_url.parse(
+            DATABASE_URL,
             conn_max_age=600,
+            # Persistent connections are pinged once per request before reuse.
+            conn_health_checks=True,
             ssl_require=False,
         )
     }
 else:
+    # Local SQLite default, built directly instead of importing and parsing a URL.
     DATABASES = {
         "default": {
             "ENGINE": "django.db.backends.sqlite3",
             "NAME": BASE_DIR / "db.sqlite3",
+            "CONN_MAX_AGE": 600,
+            "CONN_HEALTH_CHECKS": True,
         }
     }
 
@@ -106,13 +114,17 @@ STORAGES = {
             if IS_VERCEL
             else (
             "whitenoise.storage.CompressedManifestStaticFilesStorage"
-            if importlib.util.find_spec("whitenoise")
+            if HAS_WHITENOISE
             else "django.contrib.staticfiles.storage.StaticFilesStorage"
             )
         ),
     },
 }
 
+# collectstatic writes .gz and, with the Brotli package installed, .br copies of each hashed file;
+# templates only reference hashed names through {% static %}, so the originals are not kept.
+WHITENOISE_KEEP_ONLY_HASHED_FILES = True
+
 CSRF_TRUSTED_ORIGINS = [origin.strip() for origin in os.getenv("CSRF_TRUSTED_ORIGINS", "").split(",") if origin.strip()]
 if RENDER_EXTERNAL_HOSTNAME:
     CSRF_TRUSTED_ORIGINS.append(f"https://{RENDER_EXTERNAL_HOSTNAME}")
@@ -127,3 +139,6 @@ if not DEBUG:
     CSRF_COOKIE_SECURE = True
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+# Directory for rendered PDF exports keyed by CV content; empty disables the cache.
+CV_PDF_CACHE_DIR = os.getenv("CV_PDF_CACHE_DIR", "")